@@ -470,6 +470,26 @@ async def save_visualization(data: Dict[str, Any]) -> Dict[str, Any]:
     return serialize_doc(data)
 
 
+async def save_visualizations_bulk(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Save several generated visualizations in a single round trip"""
+    if not docs:
+        return []
+    
+    collection = await get_collection("visualizations")
+    
+    now = datetime.utcnow()
+    for data in docs:
+        if "timestamp" not in data:
+            data["timestamp"] = now
+    
+    # Unordered, so one bad document doesn't stop the rest being written
+    result = await collection.insert_many(docs, ordered=False)
+    for data, inserted_id in zip(docs, result.inserted_ids):
+        data["_id"] = inserted_id
+    
+    return [serialize_doc(data) for data in docs]
+
+
 async def get_visualizations(
     project_id: Optional[str] = None,
     diagram_type: Optional[str] = None,
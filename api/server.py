@@ -1146,7 +1146,7 @@ async def estimate_parameters(request: QuickEstimateRequest):
         "location": request.region
     }
     
-    result = agent.handle(input_data)
+    result = await agent.ahandle(input_data)
     
     return result
 
@@ -1170,7 +1170,7 @@ async def estimate_circularity(request: CircularityRequest):
         "eol_recycling_rate": request.eol_recycling_rate
     }
     
-    result = agent.handle(input_data)
+    result = await agent.ahandle(input_data)
     
     return result
 
@@ -1232,7 +1232,7 @@ async def compare_scenarios(scenarios: list[dict]):
         "comparison_type": "multi_scenario"
     }
     
-    result = agent.handle(comparison_input)
+    result = await agent.ahandle(comparison_input)
     
     return result
 
@@ -0,0 +1,122 @@
+import os
+import re
+import uuid
+import functools
+from types import SimpleNamespace
+from typing import AsyncIterator, ClassVar, Dict, Union
+from circu_metal.utils import fast_json
+from circu_metal.utils.io import load_prompt
+from circu_metal.utils.loop import await_in_background_loop, run_in_background_loop
+from circu_metal.utils.retry import run_with_retry
+
+# Opening/closing markdown code fences around a whole response
+_FENCE_RE = re.compile(r"\A```(?:json|markdown)?|```\Z")
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'prompts')
+
+@functools.cache
+def _adk() -> SimpleNamespace:
+    """Imports the ADK runtime pieces on first use rather than at module import."""
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+    return SimpleNamespace(Runner=Runner, InMemorySessionService=InMemorySessionService, types=types)
+
+class AdkAgentHandleMixin:
+    """
+    Shared sync handle() for the legacy ADK agents.
+
+    Runs the agent through a lazily built, reused Runner on the background
+    loop, collects the streamed text and hands it to _parse(). Subclasses
+    override _parse() for their output format; the default expects JSON.
+    """
+
+    # Prompt text keyed by path, shared by all instances
+    _PROMPT_CACHE: ClassVar[Dict[str, str]] = {}
+
+    @classmethod
+    def _load_instruction(cls, prompt_file: str, default: str) -> str:
+        prompt_path = os.path.join(PROMPTS_DIR, prompt_file)
+        cache = AdkAgentHandleMixin._PROMPT_CACHE
+        if prompt_path not in cache:
+            cache[prompt_path] = load_prompt(prompt_path, default)
+        return cache[prompt_path]
+
+    def _get_runner(self):
+        runner = getattr(self, "_runner", None)
+        if runner is None:
+            adk = _adk()
+            self._session_service = adk.InMemorySessionService()
+            runner = adk.Runner(agent=self, app_name="agents", session_service=self._session_service)
+            self._runner = runner
+        return runner
+
+    async def stream(self, input: Union[dict, str]) -> AsyncIterator[str]:
+        """
+        Yields response text chunks as the model produces them.
+        input may also be given already serialized as JSON text.
+        """
+        types = _adk().types
+        runner = self._get_runner()
+        session_service = self._session_service
+        input_str = input if isinstance(input, str) else fast_json.dumps(input)
+        session_id = uuid.uuid4().hex
+        await session_service.create_session(app_name="agents", user_id="user", session_id=session_id)
+        content = types.Content(role='user', parts=[types.Part(text=input_str)])
+
+        try:
+            async for event in runner.run_async(user_id="user", session_id=session_id, new_message=content):
+                event_content = getattr(event, 'content', None)
+                if event_content is None:
+                    continue
+                event_parts = event_content.parts
+                if not event_parts:
+                    continue
+                for part in event_parts:
+                    text = part.text
+                    if text:
+                        yield text
+        finally:
+            # Sessions are single-turn, so drop them to keep the shared service bounded
+            await session_service.delete_session(app_name="agents", user_id="user", session_id=session_id)
+
+    async def _run_and_collect(self, input: dict) -> str:
+        parts = []
+        append = parts.append
+        async for text in self.stream(input):
+            append(text)
+        return "".join(parts)
+
+    def _parse(self, text: str) -> dict:
+        """Parses the fence-stripped response text. Defaults to JSON."""
+        return fast_json.loads(text)
+
+    async def _run_and_parse(self, input: dict) -> dict:
+        result_text = await run_with_retry(self._run_and_collect, input)
+        # Strip markdown code fences wrapping the whole text
+        clean_text = _FENCE_RE.sub("", result_text.strip()).strip()
+        return self._parse(clean_text)
+
+    def _failure(self, e: Exception) -> dict:
+        return {
+            "status": "failure",
+            "data": {},
+            "log": f"Error in {type(self).__name__}: {str(e)}",
+            "confidence": 0.0
+        }
+
+    def handle(self, input: dict) -> dict:
+        try:
+            return run_in_background_loop(self._run_and_parse(input))
+        except Exception as e:
+            return self._failure(e)
+
+    async def ahandle(self, input: dict) -> dict:
+        """
+        Async counterpart of handle() for callers already on an event loop.
+        The run still happens on the background loop the Runner is bound to.
+        """
+        try:
+            return await await_in_background_loop(self._run_and_parse(input))
+        except Exception as e:
+            return self._failure(e)
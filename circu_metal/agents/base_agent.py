@@ -15,16 +15,23 @@ import asyncio
 import hashlib
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, ClassVar, Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 import uuid
 import httpx
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from circu_metal.utils import fast_json
 from circu_metal.utils.retry import run_with_retry
 
 logger = logging.getLogger(__name__)
@@ -50,6 +57,9 @@ class ServiceConfig:
     lca_url: str = "http://localhost:8002"
     compliance_url: str = "http://localhost:8003"
     timeout: float = 30.0
+    max_connections: int = 256
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 60.0
 
 
 class BaseCircuMetalAgent(Agent):
@@ -67,6 +77,9 @@ class BaseCircuMetalAgent(Agent):
     # Allow extra fields for Pydantic model
     model_config = {"extra": "allow"}
     
+    # LLM responses longer than this are parsed off the event loop
+    PARSE_OFFLOAD_CHARS: ClassVar[int] = 16 * 1024
+    
     def __init__(
         self,
         name: str,
@@ -127,12 +140,23 @@ class BaseCircuMetalAgent(Agent):
         self.service_config = service_config or ServiceConfig()
         self.agent_id = str(uuid.uuid4())
         self._http_client: Optional[httpx.AsyncClient] = None
+        
+        # ADK runner and session service, built on first LLM call
+        self._runner: Optional[Runner] = None
+        self._session_service: Optional[InMemorySessionService] = None
 
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client for service calls."""
         if self._http_client is None or self._http_client.is_closed:
+            config = self.service_config
             self._http_client = httpx.AsyncClient(
-                timeout=self.service_config.timeout
+                timeout=config.timeout,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry
+                ),
+                http2=HTTP2_AVAILABLE
             )
         return self._http_client
 
@@ -141,8 +165,14 @@ class BaseCircuMetalAgent(Agent):
         if self._http_client and not self._http_client.is_closed:
             await self._http_client.aclose()
 
+    async def aclose(self):
+        """Close the pooled HTTP client (alias of ``close``)."""
+        await self.close()
+
     def _hash_data(self, data: Any) -> str:
         """Generate SHA256 hash of data for audit trail."""
+        # Stdlib json keeps hashes stable across installs and matches
+        # existing audit records, whether or not orjson is available
         json_str = json.dumps(data, sort_keys=True, default=str)
         return hashlib.sha256(json_str.encode()).hexdigest()
 
@@ -188,7 +218,8 @@ class BaseCircuMetalAgent(Agent):
         endpoint: str,
         method: str = "POST",
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        max_response_bytes: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Call a microservice endpoint.
@@ -199,6 +230,8 @@ class BaseCircuMetalAgent(Agent):
             method: HTTP method
             data: Request body for POST
             params: Query parameters
+            max_response_bytes: If set, stop reading non-JSON responses after
+                this many bytes and return them as {"content", "truncated"}
             
         Returns:
             Service response as dictionary
@@ -217,15 +250,20 @@ class BaseCircuMetalAgent(Agent):
         client = await self._get_http_client()
         
         try:
+            if max_response_bytes is not None:
+                return await self._call_service_streamed(
+                    client, method, url, data, params, max_response_bytes
+                )
+            
             if method.upper() == "GET":
                 response = await client.get(url, params=params)
             elif method.upper() == "POST":
-                response = await client.post(url, json=data)
+                response = await client.post(url, **self._json_request_body(data))
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
             response.raise_for_status()
-            return response.json()
+            return fast_json.loads(response.content)
             
         except httpx.HTTPError as e:
             logger.error(f"Service call failed: {service}{endpoint} - {e}")
@@ -234,6 +272,52 @@ class BaseCircuMetalAgent(Agent):
             logger.error(f"Unexpected error calling {service}: {e}")
             return {"error": str(e), "status": "error"}
 
+    @staticmethod
+    def _json_request_body(data: Optional[Dict]) -> Dict[str, Any]:
+        """Encode a request body with fast_json for httpx."""
+        if data is None:
+            return {}
+        return {
+            "content": fast_json.dumps(data, default=str),
+            "headers": {"Content-Type": "application/json"}
+        }
+
+    async def _call_service_streamed(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        data: Optional[Dict],
+        params: Optional[Dict],
+        max_bytes: int
+    ) -> Dict[str, Any]:
+        """Call a service, reading at most max_bytes of a non-JSON body."""
+        method = method.upper()
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+        
+        body = self._json_request_body(data) if method == "POST" else {}
+        async with client.stream(method, url, params=params, **body) as response:
+            response.raise_for_status()
+            
+            # JSON cannot be parsed from a prefix, so read it in full
+            if "json" in response.headers.get("content-type", ""):
+                await response.aread()
+                return fast_json.loads(response.content)
+            
+            body = bytearray()
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= max_bytes:
+                    truncated = len(body) > max_bytes
+                    break
+            
+            return {
+                "content": body[:max_bytes].decode(response.encoding or "utf-8", errors="ignore"),
+                "truncated": truncated
+            }
+
     def _parse_llm_response(self, response_text: str) -> Dict[str, Any]:
         """Parse LLM response, handling markdown code blocks."""
         clean_text = response_text.strip()
@@ -250,16 +334,16 @@ class BaseCircuMetalAgent(Agent):
         clean_text = clean_text.strip()
         
         try:
-            return json.loads(clean_text)
-        except json.JSONDecodeError as e:
+            return fast_json.loads(clean_text)
+        except fast_json.JSONDecodeError as e:
             logger.warning(f"Failed to parse JSON response: {e}")
             # Try to extract JSON from the text
             import re
             json_match = re.search(r'\{[\s\S]*\}', clean_text)
             if json_match:
                 try:
-                    return json.loads(json_match.group())
-                except json.JSONDecodeError:
+                    return fast_json.loads(json_match.group())
+                except fast_json.JSONDecodeError:
                     pass
             
             return {
@@ -268,6 +352,50 @@ class BaseCircuMetalAgent(Agent):
                 "error": str(e)
             }
 
+    def _parse_llm_array(self, response_text: str) -> Optional[List[Any]]:
+        """
+        Parse an LLM response expected to be a top-level JSON array, as
+        returned for batched requests. Returns None if no array is found.
+        """
+        parsed = self._parse_llm_response(response_text)
+        if isinstance(parsed, list):
+            return parsed
+        
+        # The array may be wrapped in prose the object parser skipped past
+        import re
+        array_match = re.search(r'\[[\s\S]*\]', response_text)
+        if array_match:
+            try:
+                parsed = fast_json.loads(array_match.group())
+            except fast_json.JSONDecodeError:
+                return None
+            if isinstance(parsed, list):
+                return parsed
+        return None
+
+    def _get_runner(self) -> Runner:
+        """Get the agent's Runner, creating it and its session service on first use."""
+        if self._runner is None:
+            self._session_service = InMemorySessionService()
+            self._runner = Runner(
+                agent=self,
+                app_name="agents",
+                session_service=self._session_service
+            )
+        return self._runner
+
+    async def _aparse_llm_response(self, response_text: str) -> Dict[str, Any]:
+        """
+        Async _parse_llm_response. Large responses are parsed in the default
+        executor so other coroutines keep running meanwhile; small ones are
+        parsed inline, where the executor hand-off would cost more.
+        """
+        if len(response_text) <= self.PARSE_OFFLOAD_CHARS:
+            return self._parse_llm_response(response_text)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._parse_llm_response, response_text
+        )
+
     async def run_llm(self, input_data: Dict[str, Any]) -> str:
         """
         Run the LLM with the given input.
@@ -278,8 +406,9 @@ class BaseCircuMetalAgent(Agent):
         Returns:
             Raw LLM response text
         """
-        input_str = json.dumps(input_data, default=str)
-        session_service = InMemorySessionService()
+        input_str = fast_json.dumps(input_data, default=str)
+        runner = self._get_runner()
+        session_service = self._session_service
         
         session_id = str(uuid.uuid4())
         await session_service.create_session(
@@ -288,29 +417,65 @@ class BaseCircuMetalAgent(Agent):
             session_id=session_id
         )
         
-        runner = Runner(
-            agent=self,
-            app_name="agents",
-            session_service=session_service
-        )
-        
         content = types.Content(
             role='user',
             parts=[types.Part(text=input_str)]
         )
         
-        final_text = ""
-        async for event in runner.run_async(
-            user_id="user",
-            session_id=session_id,
-            new_message=content
-        ):
-            if hasattr(event, 'content') and event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        final_text += part.text
+        # Collected and joined once rather than concatenated per part
+        chunks: List[str] = []
+        append = chunks.append
+        try:
+            async for event in runner.run_async(
+                user_id="user",
+                session_id=session_id,
+                new_message=content
+            ):
+                if hasattr(event, 'content') and event.content and event.content.parts:
+                    for part in event.content.parts:
+                        if part.text:
+                            append(part.text)
+        finally:
+            # Sessions are single-turn, so drop them to keep the shared service bounded
+            await session_service.delete_session(
+                app_name="agents",
+                user_id="user",
+                session_id=session_id
+            )
         
-        return final_text
+        return "".join(chunks)
+
+    async def run_llm_batch(self, inputs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Run several independent LLM inputs as a single request.
+        
+        Falls back to one request per input if the batched response
+        cannot be split back into per-input results.
+        
+        Args:
+            inputs: Input dictionaries to send to LLM
+            
+        Returns:
+            Raw LLM response text for each input, in order
+        """
+        if len(inputs) == 1:
+            return [await self.run_llm(inputs[0])]
+        
+        response_text = await self.run_llm({
+            "task": "batch",
+            "requests": inputs,
+            "request": (
+                "Handle each entry in 'requests' independently. Return a JSON "
+                "array with exactly one response object per entry, in the same order."
+            )
+        })
+        
+        parsed = self._parse_llm_array(response_text)
+        if parsed is not None and len(parsed) == len(inputs):
+            return [fast_json.dumps(item, default=str) for item in parsed]
+        
+        logger.warning("Batched LLM response did not match request count; running individually")
+        return list(await asyncio.gather(*(self.run_llm(i) for i in inputs)))
 
     async def run_llm_raw(self, prompt: str, system_instruction: str = None) -> str:
         """
@@ -347,7 +512,7 @@ class BaseCircuMetalAgent(Agent):
             system_instruction=system_instruction
         )
         
-        response = model.generate_content(prompt)
+        response = await model.generate_content_async(prompt)
         return response.text
 
     async def handle(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -396,6 +561,13 @@ class BaseCircuMetalAgent(Agent):
                 "run_id": run_id
             }
 
+    async def ahandle(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Alias of handle(), matching the async entry point of the legacy
+        agents so callers can await either kind the same way.
+        """
+        return await self.handle(input_data)
+
     async def _async_handle(
         self,
         input_data: Dict[str, Any],
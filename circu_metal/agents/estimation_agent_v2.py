@@ -208,12 +208,11 @@ class EstimationAgentV2(BaseCircuMetalAgent):
         ei = estimations.get("energy_intensity", {})
         
         # Calculate overall confidence
-        confidences = [
-            ef.get("confidence", 0.5),
-            circ.get("confidence", 0.5),
-            ei.get("confidence", 0.5)
-        ]
-        avg_confidence = sum(confidences) / len(confidences)
+        avg_confidence = (
+            ef.get("confidence", 0.5)
+            + circ.get("confidence", 0.5)
+            + ei.get("confidence", 0.5)
+        ) / 3
         
         # Build data payload
         data = {
@@ -247,12 +246,11 @@ class EstimationAgentV2(BaseCircuMetalAgent):
         }
         
         # Build log message
-        log_parts = [
-            f"Emission factor: {ef.get('value', 0):.1f} kg CO2e/t",
-            f"Circularity: {circ.get('value', 0):.2f}",
+        log = (
+            f"Estimation complete. Emission factor: {ef.get('value', 0):.1f} kg CO2e/t, "
+            f"Circularity: {circ.get('value', 0):.2f}, "
             f"Energy: {ei.get('value', 0):.1f} GJ/t"
-        ]
-        log = "Estimation complete. " + ", ".join(log_parts)
+        )
         
         return {
             "status": "success",
@@ -290,6 +288,4 @@ class EstimationAgentV2(BaseCircuMetalAgent):
 
 
 # For backward compatibility
-class EstimationAgent(EstimationAgentV2):
-    """Alias for backward compatibility."""
-    pass
+EstimationAgent = EstimationAgentV2
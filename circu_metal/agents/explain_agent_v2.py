@@ -7,14 +7,100 @@ making complex environmental data accessible to stakeholders.
 
 import os
 import json
+import asyncio
+import copy
 import logging
-from typing import Any, ClassVar, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from circu_metal.agents.base_agent import BaseCircuMetalAgent, ServiceConfig
 
 logger = logging.getLogger(__name__)
 
+# Parsed LLM responses keyed by input hash (LRU). Kept at module level
+# because callers build a new agent for each request
+_LLM_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LLM_CACHE_LOCK = threading.Lock()
+
+# Set while the sections of a full explanation run, so only their LLM
+# calls go through the batcher
+_batch_llm_calls: ContextVar[bool] = ContextVar("_batch_llm_calls", default=False)
+
+# Fallback explanation text, used when the LLM is unavailable
+_FALLBACK_HEAD = (
+    "The life cycle assessment shows a total carbon footprint of "
+    "{gwp} kg CO2e ({gwp_per_t} kg CO2e per tonne of product). "
+)
+_FALLBACK_BENCHMARKS = (
+    "This is below typical benchmarks, indicating good environmental performance.",
+    "This is within typical industry ranges for this type of production.",
+    "This is above typical industry benchmarks, indicating room for improvement."
+)
+
+
+class _LLMBatcher:
+    """
+    Coalesces LLM calls submitted within a short window into one request.
+    
+    Concurrent explanation requests share a single batched LLM round-trip
+    instead of each paying for their own.
+    """
+    
+    def __init__(
+        self,
+        agent: BaseCircuMetalAgent,
+        window_ms: float = 20,
+        max_batch: int = 8
+    ):
+        self._agent = agent
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, llm_input: Dict[str, Any]) -> str:
+        """Queue an LLM input and wait for its response text."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((llm_input, future))
+        
+        if len(self._pending) >= self._max_batch:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+        
+        return await future
+
+    def _flush(self):
+        """Send everything queued so far as one batch."""
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Hold a reference so the task is not collected mid-flight
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        try:
+            responses = await self._agent.run_llm_batch([llm_input for llm_input, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
 
 class ExplainAgentV2(BaseCircuMetalAgent):
     """
@@ -56,6 +142,41 @@ class ExplainAgentV2(BaseCircuMetalAgent):
             "metrics": ["emission_limits", "compliance_status", "verification"]
         }
     }
+    
+    # Focus lists are static, so join them for prompts once
+    _FOCUS_STR: ClassVar[Dict[str, str]] = {
+        stakeholder: ", ".join(profile["focus"])
+        for stakeholder, profile in STAKEHOLDERS.items()
+    }
+    
+    # Profile used for unknown stakeholders
+    _DEFAULT_PROFILE: ClassVar[Dict[str, Any]] = STAKEHOLDERS["sustainability_manager"]
+
+    # Map metric names to result paths
+    _METRIC_PATHS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "gwp": ("impact_assessment", "total_gwp_kg_co2e"),
+        "total_gwp": ("impact_assessment", "total_gwp_kg_co2e"),
+        "gwp_per_tonne": ("impact_assessment", "gwp_per_tonne"),
+        "water": ("impact_assessment", "water_consumption_m3"),
+        "energy": ("impact_assessment", "energy_consumption_gj"),
+        "mci": ("circularity_metrics", "mci"),
+        "carbon_intensity": ("impact_assessment", "gwp_per_tonne"),
+        "carbon_footprint": ("impact_assessment", "total_gwp_kg_co2e")
+    }
+
+    # LCA result sections included in explanation prompts
+    _EXPLAIN_SECTIONS: ClassVar[Tuple[str, ...]] = ("impact_assessment", "circularity_metrics")
+
+    # Maximum number of cached LLM responses
+    LLM_CACHE_SIZE: ClassVar[int] = 128
+
+    # Quality score recorded for each provenance source
+    _PROVENANCE_SOURCES: ClassVar[Dict[str, float]] = {
+        "explain_agent": 0.85,
+        "summary_generator": 0.8,
+        "comparison_explainer": 0.85,
+        "recommendation_engine": 0.8
+    }
 
     def __init__(
         self,
@@ -68,6 +189,19 @@ class ExplainAgentV2(BaseCircuMetalAgent):
             prompt_file="explain_agent.md",
             service_config=service_config
         )
+        
+        self._llm_batcher = _LLMBatcher(self)
+        
+        # Constant part of each provenance record; only the date varies
+        self._provenance_templates = {
+            source: MappingProxyType({
+                "source": source,
+                "citation": None,
+                "agent_id": self.agent_id,
+                "quality_score": quality_score
+            })
+            for source, quality_score in self._PROVENANCE_SOURCES.items()
+        }
 
     async def _async_handle(
         self,
@@ -88,9 +222,39 @@ class ExplainAgentV2(BaseCircuMetalAgent):
             return await self._explain_comparison(input_data, provenance, run_id)
         elif action == "recommend":
             return await self._generate_recommendations(input_data, provenance, run_id)
+        elif action == "full":
+            return await self._explain_full(input_data, provenance, run_id)
         else:
             return await super()._async_handle(input_data, run_id)
 
+    async def _run_llm_cached(self, llm_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the LLM and parse its response, reusing earlier responses
+        for identical inputs.
+        """
+        key = self._hash_data({"model": self.model, "input": llm_input})
+        with _LLM_CACHE_LOCK:
+            cached = _LLM_CACHE.get(key)
+            if cached is not None:
+                _LLM_CACHE.move_to_end(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        if _batch_llm_calls.get():
+            response = await self._llm_batcher.submit(llm_input)
+        else:
+            response = await self.run_llm(llm_input)
+        parsed = self._parse_llm_response(response)
+        
+        # Don't cache responses that could not be parsed
+        if not (isinstance(parsed, dict) and parsed.get("status") == "parse_error"):
+            with _LLM_CACHE_LOCK:
+                _LLM_CACHE[key] = copy.deepcopy(parsed)
+                if len(_LLM_CACHE) > self.LLM_CACHE_SIZE:
+                    _LLM_CACHE.popitem(last=False)
+        
+        return parsed
+
     async def _explain_results(
         self,
         input_data: Dict[str, Any],
@@ -103,15 +267,22 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         language = input_data.get("language", "en")
         
         # Get stakeholder profile
-        profile = self.STAKEHOLDERS.get(stakeholder, self.STAKEHOLDERS["sustainability_manager"])
+        profile = self.STAKEHOLDERS.get(stakeholder, self._DEFAULT_PROFILE)
+        focus_str = self._FOCUS_STR.get(stakeholder) or ", ".join(profile["focus"])
         
         # Extract key metrics
         key_metrics = self._extract_key_metrics(lca_results, profile["metrics"])
         
+        # Only send the result sections the explanation draws on, to keep
+        # the prompt small; fall back to everything for other result shapes
+        prompt_results = {
+            k: lca_results[k] for k in self._EXPLAIN_SECTIONS if k in lca_results
+        } or lca_results
+        
         # Generate explanation using LLM
         llm_input = {
             "task": "explain_lca_results",
-            "lca_results": lca_results,
+            "lca_results": prompt_results,
             "key_metrics": key_metrics,
             "stakeholder": stakeholder,
             "stakeholder_focus": profile["focus"],
@@ -119,22 +290,18 @@ class ExplainAgentV2(BaseCircuMetalAgent):
             "language": language,
             "request": (
                 f"Explain these LCA results for a {stakeholder}. "
-                f"Focus on {', '.join(profile['focus'])}. "
+                f"Focus on {focus_str}. "
                 f"Use {profile['detail_level']} level of detail."
             )
         }
         
         try:
-            response = await self.run_llm(llm_input)
-            explanation = self._parse_llm_response(response)
+            explanation = await self._run_llm_cached(llm_input)
         except Exception as e:
             logger.error(f"LLM explanation failed: {e}")
             explanation = self._generate_fallback_explanation(lca_results, profile)
         
-        provenance.append(self._create_provenance(
-            source="explain_agent",
-            quality_score=0.85
-        ))
+        provenance.append(self._provenance("explain_agent"))
         
         return {
             "status": "success",
@@ -175,16 +342,12 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         }
         
         try:
-            response = await self.run_llm(llm_input)
-            summary = self._parse_llm_response(response)
+            summary = await self._run_llm_cached(llm_input)
         except Exception as e:
             logger.error(f"Summary generation failed: {e}")
             summary = {"summary": "Executive summary generation failed."}
         
-        provenance.append(self._create_provenance(
-            source="summary_generator",
-            quality_score=0.8
-        ))
+        provenance.append(self._provenance("summary_generator"))
         
         return {
             "status": "success",
@@ -231,16 +394,12 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         }
         
         try:
-            response = await self.run_llm(llm_input)
-            explanation = self._parse_llm_response(response)
+            explanation = await self._run_llm_cached(llm_input)
         except Exception as e:
             logger.error(f"Comparison explanation failed: {e}")
             explanation = {}
         
-        provenance.append(self._create_provenance(
-            source="comparison_explainer",
-            quality_score=0.85
-        ))
+        provenance.append(self._provenance("comparison_explainer"))
         
         return {
             "status": "success",
@@ -285,16 +444,12 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         }
         
         try:
-            response = await self.run_llm(llm_input)
-            recs = self._parse_llm_response(response)
+            recs = await self._run_llm_cached(llm_input)
         except Exception as e:
             logger.error(f"Recommendation generation failed: {e}")
             recs = {}
         
-        provenance.append(self._create_provenance(
-            source="recommendation_engine",
-            quality_score=0.8
-        ))
+        provenance.append(self._provenance("recommendation_engine"))
         
         return {
             "status": "success",
@@ -311,6 +466,71 @@ class ExplainAgentV2(BaseCircuMetalAgent):
             "run_id": run_id
         }
 
+    async def _explain_full(
+        self,
+        input_data: Dict[str, Any],
+        provenance: List[Dict],
+        run_id: str
+    ) -> Dict[str, Any]:
+        """Generate explanation, summary and recommendations concurrently."""
+        sections = {
+            "explanation": self._explain_results,
+            "summary": self._generate_summary,
+            "recommendations": self._generate_recommendations
+        }
+        section_provenance = {name: [] for name in sections}
+        
+        # The sections' LLM calls are sent together as one batched request
+        token = _batch_llm_calls.set(True)
+        try:
+            results = await asyncio.gather(
+                *(
+                    handler(input_data, section_provenance[name], run_id)
+                    for name, handler in sections.items()
+                ),
+                return_exceptions=True
+            )
+        finally:
+            _batch_llm_calls.reset(token)
+        
+        data = {}
+        failed = []
+        confidences = []
+        for name, result in zip(sections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Full explanation section '{name}' failed: {result}")
+                failed.append(name)
+                continue
+            data[name] = result.get("data", {})
+            confidences.append(result.get("confidence", 0.0))
+            provenance.extend(section_provenance[name])
+        
+        if not data:
+            return {
+                "status": "failure",
+                "data": {},
+                "log": "Full explanation failed for all sections",
+                "confidence": 0.0,
+                "provenance": provenance,
+                "run_id": run_id
+            }
+        
+        return {
+            "status": "partial" if failed else "success",
+            "data": data,
+            "log": (
+                f"Generated {len(data)} of {len(sections)} explanation sections"
+                + (f" (failed: {', '.join(failed)})" if failed else "")
+            ),
+            "confidence": sum(confidences) / len(confidences),
+            "provenance": provenance,
+            "run_id": run_id
+        }
+
+    def _provenance(self, source: str) -> Dict[str, Any]:
+        """Create a provenance record from the cached template for source."""
+        return {**self._provenance_templates[source], "date": datetime.utcnow().isoformat()}
+
     def _extract_key_metrics(
         self,
         lca_results: Dict[str, Any],
@@ -319,27 +539,15 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         """Extract key metrics from LCA results."""
         extracted = {}
         
-        # Map metric names to result paths
-        metric_paths = {
-            "gwp": ["impact_assessment", "total_gwp_kg_co2e"],
-            "total_gwp": ["impact_assessment", "total_gwp_kg_co2e"],
-            "gwp_per_tonne": ["impact_assessment", "gwp_per_tonne"],
-            "water": ["impact_assessment", "water_consumption_m3"],
-            "energy": ["impact_assessment", "energy_consumption_gj"],
-            "mci": ["circularity_metrics", "mci"],
-            "carbon_intensity": ["impact_assessment", "gwp_per_tonne"],
-            "carbon_footprint": ["impact_assessment", "total_gwp_kg_co2e"]
-        }
-        
         for metric in metrics_to_extract:
-            path = metric_paths.get(metric, [metric])
             value = lca_results
-            for key in path:
-                if isinstance(value, dict):
-                    value = value.get(key)
-                else:
+            for key in self._METRIC_PATHS.get(metric, (metric,)):
+                if not isinstance(value, dict):
                     value = None
                     break
+                value = value.get(key)
+                if value is None:
+                    break
             if value is not None:
                 extracted[metric] = value
         
@@ -355,23 +563,19 @@ class ExplainAgentV2(BaseCircuMetalAgent):
         gwp = impact.get("total_gwp_kg_co2e", 0)
         gwp_per_t = impact.get("gwp_per_tonne", 0)
         
-        explanation = (
-            f"The life cycle assessment shows a total carbon footprint of "
-            f"{gwp:,.0f} kg CO2e ({gwp_per_t:,.0f} kg CO2e per tonne of product). "
-        )
+        # 0: <= 1500, 1: (1500, 2000], 2: > 2000 kg CO2e/t
+        benchmark = (gwp_per_t > 1500) + (gwp_per_t > 2000)
         
-        if gwp_per_t > 2000:
-            explanation += "This is above typical industry benchmarks, indicating room for improvement."
-        elif gwp_per_t > 1500:
-            explanation += "This is within typical industry ranges for this type of production."
-        else:
-            explanation += "This is below typical benchmarks, indicating good environmental performance."
+        # Format the figures once and reuse them in every string below
+        gwp_str = f"{gwp:,.0f}"
+        gwp_per_t_str = f"{gwp_per_t:,.0f}"
+        explanation = _FALLBACK_HEAD.format(gwp=gwp_str, gwp_per_t=gwp_per_t_str) + _FALLBACK_BENCHMARKS[benchmark]
         
         return {
             "explanation": explanation,
             "key_points": [
-                f"Total GWP: {gwp:,.0f} kg CO2e",
-                f"Intensity: {gwp_per_t:,.0f} kg CO2e/t"
+                f"Total GWP: {gwp_str} kg CO2e",
+                f"Intensity: {gwp_per_t_str} kg CO2e/t"
             ]
         }
 
@@ -7,14 +7,166 @@ for comprehensive life cycle assessments.
 
 import os
 import json
+import asyncio
+import atexit
+import copy
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, TypedDict
 from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
 
 from circu_metal.agents.base_agent import BaseCircuMetalAgent, ServiceConfig
+from circu_metal.utils import fast_json
+from circu_metal.utils.disk_cache import DiskCache
 
 logger = logging.getLogger(__name__)
 
+# Repeats of the same failure (message and exception type) are logged at
+# most once per interval, so outages don't flood the logs
+_LOG_THROTTLE_SECONDS = 60.0
+_log_last_emitted: Dict[Tuple[str, str], float] = {}
+
+# Successful LCA results and LLM interpretations keyed by input hash (LRU).
+# Kept at module level because callers build a new agent for each request
+_LCA_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_INTERP_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Futures for LCA service calls in progress, by event loop and cache key,
+# so identical concurrent requests from any agent share one call
+_INFLIGHT: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _inflight_calls() -> Dict[str, asyncio.Future]:
+    """Return the in-flight LCA service calls for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _CACHE_LOCK:
+        calls = _INFLIGHT.get(loop)
+        if calls is None:
+            calls = _INFLIGHT[loop] = {}
+    return calls
+
+
+def _log_throttled(level: int, msg: str, *args: Any):
+    """Log msg at level unless the same failure was logged recently."""
+    if not logger.isEnabledFor(level):
+        return
+    key = (msg, type(args[0]).__name__ if args else "")
+    now = time.monotonic()
+    if now - _log_last_emitted.get(key, -_LOG_THROTTLE_SECONDS) < _LOG_THROTTLE_SECONDS:
+        return
+    _log_last_emitted[key] = now
+    logger.log(level, msg, *args)
+
+# Optional persistent cache of LCA results shared across restarts, opened
+# on first use from CIRCUMETAL_LCA_CACHE and closed at exit
+_disk_cache: Optional[DiskCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def _get_disk_cache() -> Optional[DiskCache]:
+    """Return the shared on-disk LCA cache, or None if it isn't configured."""
+    global _disk_cache
+    if _disk_cache is None:
+        cache_dir = os.getenv("CIRCUMETAL_LCA_CACHE")
+        if not cache_dir:
+            return None
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = DiskCache(cache_dir)
+                atexit.register(_disk_cache.close)
+    return _disk_cache
+
+# Local LCA engine used when the service is unavailable. Imported on first
+# use: importing lca_service configures logging and builds its service app
+_fallback_engine = None
+_fallback_engine_lock = threading.Lock()
+
+
+def _get_fallback_engine():
+    """Return the shared local LCA engine, or None if lca_service can't be imported."""
+    global _fallback_engine
+    if _fallback_engine is None:
+        with _fallback_engine_lock:
+            if _fallback_engine is None:
+                try:
+                    from lca_service.engine import LCAEngine
+                except ImportError:
+                    return None
+                _fallback_engine = LCAEngine()
+    return _fallback_engine
+
+# Fixed instruction for LCA result interpretation; kept constant so the
+# prompt prefix is identical across calls
+_INTERP_PROMPT = (
+    "Analyze these LCA results. Identify hotspots, compare to industry "
+    "benchmarks, and provide actionable recommendations for improvement. "
+    "Consider both environmental and economic factors."
+)
+
+
+class _LCARequest(TypedDict):
+    """LCA service request body."""
+    project_id: str
+    scenario_id: str
+    metal_type: str
+    production_route: str
+    production_volume_tonnes: float
+    recycled_content: float
+    energy_mix: Dict[str, float]
+    location: str
+    include_transport: bool
+    transport_km: float
+    functional_unit: str
+
+
+def _validate_lca_request(request: _LCARequest) -> List[str]:
+    """Return the problems with an LCA request body, checked before any service call."""
+    problems = []
+    # (request field, input name used in messages, minimum, maximum)
+    for field, name, low, high in (
+        ("production_volume_tonnes", "production_volume", 0, None),
+        ("recycled_content", "recycled_content", 0, 1),
+        ("transport_km", "transport_km", 0, None)
+    ):
+        value = request[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            problems.append(f"{name} must be a number, got {value!r}")
+        elif value < low or (high is not None and value > high):
+            bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+            problems.append(f"{name} must be {bounds}, got {value!r}")
+    if not isinstance(request["energy_mix"], dict):
+        problems.append("energy_mix must be a mapping of source to share")
+    return problems
+
+
+def _rank_gwp(gwps: np.ndarray) -> Tuple[List[int], float]:
+    """
+    Rank scenarios by GWP, lowest first.
+    
+    Returns the stable ascending order (ties keep input order) and the
+    improvement potential of the best over the worst scenario, in percent.
+    """
+    order = np.argsort(gwps, kind="stable").tolist()
+    best, worst = float(gwps[order[0]]), float(gwps[order[-1]])
+    improvement = (worst - best) / worst * 100 if worst > 0 else 0
+    return order, improvement
+
+
+def _fmt_int(value: float) -> str:
+    """Format a number rounded to an integer with thousands separators."""
+    # The float spec prints nan/inf instead of raising like round() would
+    return format(value, ",.0f")
+
 
 class LCAAgentV2(BaseCircuMetalAgent):
     """
@@ -28,6 +180,21 @@ class LCAAgentV2(BaseCircuMetalAgent):
     - Hotspot identification
     """
     
+    # Maximum number of cached LCA results and interpretations
+    LCA_CACHE_SIZE: ClassVar[int] = 512
+    
+    # Maximum report characters returned in responses
+    REPORT_PREVIEW_CHARS: ClassVar[int] = 5000
+    
+    # Bytes read from the report body; UTF-8 needs at most 4 per character
+    REPORT_PREVIEW_BYTES: ClassVar[int] = 4 * REPORT_PREVIEW_CHARS
+    
+    # Citation and quality score recorded for each provenance source
+    _PROVENANCE_SOURCES: ClassVar[Dict[str, Tuple[Optional[str], float]]] = {
+        "lca_calculation_engine": ("ISO 14040/14044 methodology", 0.85),
+        "lca_comparison_engine": (None, 0.85)
+    }
+    
     def __init__(
         self,
         model_name: str = "gemini-2.0-flash-001",
@@ -39,6 +206,52 @@ class LCAAgentV2(BaseCircuMetalAgent):
             prompt_file="lca_agent.md",
             service_config=service_config
         )
+        
+        # Action name -> handler(input_data, provenance, run_id)
+        self._actions = {
+            "calculate": self._calculate_lca,
+            "compare": self._compare_scenarios,
+            "report": self._generate_report
+        }
+        
+        # Constant part of each provenance record; only the date varies
+        self._provenance_templates = {
+            source: MappingProxyType({
+                "source": source,
+                "citation": citation,
+                "agent_id": self.agent_id,
+                "quality_score": quality_score
+            })
+            for source, (citation, quality_score) in self._PROVENANCE_SOURCES.items()
+        }
+
+    @staticmethod
+    def _cache_key(data: Any) -> str:
+        """Compact 128-bit BLAKE2b cache key for JSON-like data."""
+        canonical = fast_json.dumps(data, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+    def _cache_get(self, cache: OrderedDict, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached value and mark it as recently used."""
+        with _CACHE_LOCK:
+            value = cache.get(key)
+            if value is None:
+                return None
+            cache.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def _cache_put(self, cache: OrderedDict, key: str, value: Dict[str, Any]):
+        """Store a value, evicting the least recently used entry when full."""
+        value = copy.deepcopy(value)
+        with _CACHE_LOCK:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > self.LCA_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _provenance(self, source: str) -> Dict[str, Any]:
+        """Create a provenance record from the cached template for source."""
+        return {**self._provenance_templates[source], "date": datetime.utcnow().isoformat()}
 
     async def _async_handle(
         self,
@@ -48,18 +261,12 @@ class LCAAgentV2(BaseCircuMetalAgent):
         """
         Process LCA request using LCA service + LLM reasoning.
         """
-        provenance = []
-        action = input_data.get("action", "calculate")
-        
-        if action == "calculate":
-            return await self._calculate_lca(input_data, provenance, run_id)
-        elif action == "compare":
-            return await self._compare_scenarios(input_data, provenance, run_id)
-        elif action == "report":
-            return await self._generate_report(input_data, provenance, run_id)
-        else:
+        handler = self._actions.get(input_data.get("action", "calculate"))
+        if handler is None:
             # Default to LLM handling
             return await super()._async_handle(input_data, run_id)
+        
+        return await handler(input_data, [], run_id)
 
     async def _calculate_lca(
         self,
@@ -69,7 +276,7 @@ class LCAAgentV2(BaseCircuMetalAgent):
     ) -> Dict[str, Any]:
         """Calculate LCA using the LCA service."""
         # Build LCA request
-        lca_request = {
+        lca_request: _LCARequest = {
             "project_id": input_data.get("project_id", "default"),
             "scenario_id": input_data.get("scenario_id", "baseline"),
             "metal_type": input_data.get("metal_type", "steel"),
@@ -83,18 +290,23 @@ class LCAAgentV2(BaseCircuMetalAgent):
             "functional_unit": input_data.get("functional_unit", "1 tonne product")
         }
         
-        # Call LCA service
+        # Reject unusable inputs before spending a service call and an LLM call
+        problems = _validate_lca_request(lca_request)
+        if problems:
+            return {
+                "status": "failure",
+                "data": {"validation_errors": problems},
+                "log": f"Invalid LCA input: {'; '.join(problems)}",
+                "confidence": 0.0,
+                "run_id": run_id
+            }
+        
+        # Call LCA service, then have the LLM interpret that same result
         lca_result = await self._call_lca_service(lca_request)
+        interpretation = await self._interpret_results(lca_result, input_data)
         
         if lca_result.get("status") == "success":
-            provenance.append(self._create_provenance(
-                source="lca_calculation_engine",
-                citation="ISO 14040/14044 methodology",
-                quality_score=0.85
-            ))
-        
-        # Get LLM interpretation
-        interpretation = await self._interpret_results(lca_result, input_data)
+            provenance.append(self._provenance("lca_calculation_engine"))
         
         return self._build_lca_response(
             lca_result=lca_result,
@@ -108,24 +320,60 @@ class LCAAgentV2(BaseCircuMetalAgent):
         request: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Call the LCA calculation service."""
+        key = self._cache_key(request)
+        cached = self._cache_get(_LCA_CACHE, key)
+        if cached is not None:
+            return cached
+        
+        # Share an identical request that is already in flight
+        inflight_calls = _inflight_calls()
+        inflight = inflight_calls.get(key)
+        if inflight is not None:
+            return copy.deepcopy(await asyncio.shield(inflight))
+        
+        future = asyncio.get_running_loop().create_future()
+        inflight_calls[key] = future
         try:
-            result = await self.call_service(
-                service="lca",
-                endpoint="/lca/calculate",
-                method="POST",
-                data=request
-            )
+            # SQLite I/O runs in a worker thread to keep the loop free
+            disk_cache = _get_disk_cache()
+            result = None
+            if disk_cache is not None:
+                result = await asyncio.to_thread(disk_cache.get, key)
+                if result is not None:
+                    self._cache_put(_LCA_CACHE, key, result)
+            
+            if result is None:
+                try:
+                    result = await self.call_service(
+                        service="lca",
+                        endpoint="/lca/calculate",
+                        method="POST",
+                        data=request
+                    )
+                except Exception as e:
+                    _log_throttled(logging.ERROR, "LCA service call failed: %s", e)
+                    result = self._fallback_lca(request)
+                
+                # Only cache successful results so failures are retried
+                if "error" not in result:
+                    self._cache_put(_LCA_CACHE, key, result)
+                    if disk_cache is not None:
+                        await asyncio.to_thread(disk_cache.set, key, result)
+            future.set_result(result)
             return result
-        except Exception as e:
-            logger.error(f"LCA service call failed: {e}")
-            return self._fallback_lca(request)
+        finally:
+            if not future.done():
+                future.cancel()
+            del inflight_calls[key]
 
     def _fallback_lca(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback LCA calculation when service is unavailable."""
         try:
-            from lca_service.engine import LCAEngine
+            engine = _get_fallback_engine()
+            if engine is None:
+                _log_throttled(logging.ERROR, "Fallback LCA unavailable: lca_service.engine could not be imported")
+                return {"status": "error", "error": "Local LCA engine not available"}
             
-            engine = LCAEngine()
             result = engine.calculate(
                 metal_type=request.get("metal_type", "steel"),
                 production_route=request.get("production_route", "bf_bof"),
@@ -146,7 +394,7 @@ class LCAAgentV2(BaseCircuMetalAgent):
                 "method": "fallback_local_engine"
             }
         except Exception as e:
-            logger.error(f"Fallback LCA failed: {e}")
+            _log_throttled(logging.ERROR, "Fallback LCA failed: %s", e)
             return {"status": "error", "error": str(e)}
 
     async def _interpret_results(
@@ -155,6 +403,17 @@ class LCAAgentV2(BaseCircuMetalAgent):
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Use LLM to interpret LCA results."""
+        key = self._cache_key((
+            self.model,
+            lca_result,
+            context.get("metal_type"),
+            context.get("location"),
+            context.get("production_route")
+        ))
+        cached = self._cache_get(_INTERP_CACHE, key)
+        if cached is not None:
+            return cached
+        
         llm_input = {
             "task": "interpret_lca_results",
             "lca_results": lca_result,
@@ -163,19 +422,19 @@ class LCAAgentV2(BaseCircuMetalAgent):
                 "location": context.get("location"),
                 "production_route": context.get("production_route")
             },
-            "request": (
-                "Analyze these LCA results. Identify hotspots, compare to industry "
-                "benchmarks, and provide actionable recommendations for improvement. "
-                "Consider both environmental and economic factors."
-            )
+            "request": _INTERP_PROMPT
         }
         
         try:
             response = await self.run_llm(llm_input)
-            return self._parse_llm_response(response)
+            interpretation = self._parse_llm_response(response)
         except Exception as e:
-            logger.warning(f"LLM interpretation failed: {e}")
+            _log_throttled(logging.WARNING, "LLM interpretation failed: %s", e)
             return {}
+        
+        if interpretation.get("status") != "parse_error":
+            self._cache_put(_INTERP_CACHE, key, interpretation)
+        return interpretation
 
     async def _compare_scenarios(
         self,
@@ -194,24 +453,31 @@ class LCAAgentV2(BaseCircuMetalAgent):
                 "confidence": 0.0
             }
         
-        # Calculate LCA for each scenario
+        # Calculate LCA for all scenarios concurrently
+        raw_results = await asyncio.gather(
+            *(self._call_lca_service(scenario) for scenario in scenarios),
+            return_exceptions=True
+        )
+        
         results = []
-        for scenario in scenarios:
-            result = await self._call_lca_service(scenario)
+        for scenario, result in zip(scenarios, raw_results):
+            if isinstance(result, Exception):
+                logger.error("LCA for scenario %s failed: %s", scenario.get("scenario_id", "unknown"), result)
+                result = {"status": "error", "error": str(result)}
             results.append({
                 "scenario_id": scenario.get("scenario_id", "unknown"),
                 "scenario_name": scenario.get("name", "Unnamed"),
                 "results": result.get("results", {})
             })
         
-        provenance.append(self._create_provenance(
-            source="lca_comparison_engine",
-            quality_score=0.85
-        ))
+        provenance.append(self._provenance("lca_comparison_engine"))
         
         # Analyze comparison
         comparison = self._analyze_comparison(results)
         
+        if input_data.get("interpret", False):
+            await self._interpret_scenarios(results, input_data)
+        
         return {
             "status": "success",
             "data": {
@@ -226,6 +492,43 @@ class LCAAgentV2(BaseCircuMetalAgent):
             "run_id": run_id
         }
 
+    async def _interpret_scenarios(
+        self,
+        results: List[Dict[str, Any]],
+        context: Dict[str, Any]
+    ):
+        """
+        Interpret all compared scenarios with a single LLM request.
+        
+        Adds an "interpretation" entry to each scenario result in place.
+        """
+        llm_input = {
+            "task": "interpret_lca_results_batch",
+            "scenarios": results,
+            "context": {
+                "metal_type": context.get("metal_type"),
+                "location": context.get("location")
+            },
+            "request": (
+                _INTERP_PROMPT + " Return a JSON array with exactly one analysis "
+                "object per scenario, in the same order as the input scenarios."
+            )
+        }
+        
+        try:
+            response = await self.run_llm(llm_input)
+            interpretations = self._parse_llm_response(response)
+        except Exception as e:
+            logger.warning("Batch LLM interpretation failed: %s", e)
+            return
+        
+        if not isinstance(interpretations, list) or len(interpretations) != len(results):
+            logger.warning("Batch LLM interpretation did not match scenario count; skipping")
+            return
+        
+        for result, interpretation in zip(results, interpretations):
+            result["interpretation"] = interpretation
+
     def _analyze_comparison(
         self,
         results: List[Dict[str, Any]]
@@ -234,28 +537,25 @@ class LCAAgentV2(BaseCircuMetalAgent):
         if not results:
             return {}
         
-        # Find best and worst scenarios by GWP
-        gwp_values = []
-        for r in results:
-            gwp = r.get("results", {}).get("total_gwp", float("inf"))
-            gwp_values.append((r.get("scenario_id"), gwp))
-        
-        gwp_values.sort(key=lambda x: x[1])
-        
-        best = gwp_values[0] if gwp_values else ("unknown", 0)
-        worst = gwp_values[-1] if gwp_values else ("unknown", 0)
+        # Rank scenarios by GWP (stable, so ties keep input order)
+        scenario_ids = [r.get("scenario_id") for r in results]
+        gwps = np.fromiter(
+            (r.get("results", {}).get("total_gwp", np.inf) for r in results),
+            dtype=np.float64,
+            count=len(results)
+        )
+        order, improvement = _rank_gwp(gwps)
         
-        improvement = 0
-        if worst[1] > 0:
-            improvement = (worst[1] - best[1]) / worst[1] * 100
+        best_idx, worst_idx = order[0], order[-1]
+        best_gwp, worst_gwp = float(gwps[best_idx]), float(gwps[worst_idx])
         
         return {
-            "best_scenario": best[0],
-            "best_gwp": best[1],
-            "worst_scenario": worst[0],
-            "worst_gwp": worst[1],
+            "best_scenario": scenario_ids[best_idx],
+            "best_gwp": best_gwp,
+            "worst_scenario": scenario_ids[worst_idx],
+            "worst_gwp": worst_gwp,
             "improvement_potential": round(improvement, 1),
-            "ranking": [s[0] for s in gwp_values]
+            "ranking": [scenario_ids[i] for i in order]
         }
 
     async def _generate_report(
@@ -277,14 +577,17 @@ class LCAAgentV2(BaseCircuMetalAgent):
                     "project_id": project_id,
                     "scenario_id": scenario_id,
                     "format": input_data.get("format", "html")
-                }
+                },
+                max_response_bytes=self.REPORT_PREVIEW_BYTES
             )
             
+            report_content = result.get("report_html") or result.get("content", "")
+            
             return {
                 "status": "success",
                 "data": {
                     "report_url": result.get("report_url"),
-                    "report_content": result.get("report_html", "")[:5000]
+                    "report_content": report_content[:self.REPORT_PREVIEW_CHARS]
                 },
                 "log": f"Generated {input_data.get('format', 'html')} report",
                 "confidence": 0.9,
@@ -308,11 +611,13 @@ class LCAAgentV2(BaseCircuMetalAgent):
     ) -> Dict[str, Any]:
         """Build the final LCA response."""
         results = lca_result.get("results", {})
+        total_gwp = results.get("total_gwp", 0)
+        gwp_per_tonne = results.get("gwp_per_tonne", 0)
         
         data = {
             "impact_assessment": {
-                "total_gwp_kg_co2e": results.get("total_gwp", 0),
-                "gwp_per_tonne": results.get("gwp_per_tonne", 0),
+                "total_gwp_kg_co2e": total_gwp,
+                "gwp_per_tonne": gwp_per_tonne,
                 "water_consumption_m3": results.get("total_water", 0),
                 "energy_consumption_gj": results.get("total_energy", 0)
             },
@@ -325,8 +630,8 @@ class LCAAgentV2(BaseCircuMetalAgent):
         }
         
         log = (
-            f"LCA complete. Total GWP: {results.get('total_gwp', 0):,.0f} kg CO2e "
-            f"({results.get('gwp_per_tonne', 0):,.0f} kg/t)"
+            f"LCA complete. Total GWP: {_fmt_int(total_gwp)} kg CO2e "
+            f"({_fmt_int(gwp_per_tonne)} kg/t)"
         )
         
         return {
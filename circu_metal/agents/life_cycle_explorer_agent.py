@@ -36,13 +36,13 @@ class LifeCycleExplorerAgent(Agent):
             runner = Runner(agent=self, app_name="agents", session_service=session_service)
             content = types.Content(role='user', parts=[types.Part(text=input_str)])
             
-            final_text = ""
+            chunks = []
             async for event in runner.run_async(user_id="user", session_id=session_id, new_message=content):
                 if hasattr(event, 'content') and event.content and event.content.parts:
                     for part in event.content.parts:
                         if part.text:
-                            final_text += part.text
-            return final_text
+                            chunks.append(part.text)
+            return "".join(chunks)
 
         try:
             result_text = await run_with_retry(run_agent)
@@ -73,13 +73,13 @@ class LifeCycleExplorerAgent(Agent):
             runner = Runner(agent=self, app_name="agents", session_service=session_service)
             content = types.Content(role='user', parts=[types.Part(text=input_str)])
             
-            final_text = ""
+            chunks = []
             async for event in runner.run_async(user_id="user", session_id=session_id, new_message=content):
                 if hasattr(event, 'content') and event.content and event.content.parts:
                     for part in event.content.parts:
                         if part.text:
-                            final_text += part.text
-            return final_text
+                            chunks.append(part.text)
+            return "".join(chunks)
 
         try:
             result_text = asyncio.run(run_with_retry(run_agent))
@@ -6,16 +6,160 @@ for LCA studies.
 """
 
 import os
+import sys
 import json
+import asyncio
+import functools
+import hashlib
+import heapq
 import logging
-from typing import Any, ClassVar, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 from datetime import datetime
-from copy import deepcopy
+
+import numpy as np
 
 from circu_metal.agents.base_agent import BaseCircuMetalAgent, ServiceConfig
+from circu_metal.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+# Successful LCA service results keyed by request hash (LRU). Kept at
+# module level because callers build a new agent for each request
+_LCA_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LCA_CACHE_LOCK = threading.Lock()
+
+
+def _estimate_gwp_per_tonne(recycled, renewable, tech_factor):
+    """
+    Simplified steel GWP model (kg CO2e/tonne) used when the LCA service
+    is unavailable. Works on scalars and NumPy arrays alike.
+    """
+    base_ef = 1800.0  # kg CO2e/tonne for steel
+    return base_ef * (1 - recycled * 0.75) * (1 - renewable * 0.5) * tech_factor
+
+
+def _sample_count(value: Any, maximum: int) -> Optional[int]:
+    """
+    Validate a requested sample count and clamp it to maximum.
+    Returns None for non-integers and counts below 2, which cannot
+    give a spread.
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        count = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if count != value and not isinstance(value, str):
+        return None
+    if count < 2:
+        return None
+    return min(count, maximum)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dotted parameter path, caching the result."""
+    return tuple(key.split("."))
+
+
+def _sobol_indices(
+    evaluate: Callable[[np.ndarray], np.ndarray],
+    bounds: np.ndarray,
+    n_samples: int,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First-order (S1) and total (ST) Sobol indices of a vectorized model.
+    
+    Uses the Saltelli A/B/AB_i sampling scheme with the Saltelli (2010)
+    first-order and Jansen total-effect estimators. bounds is a (k, 2)
+    array of uniform input ranges; evaluate maps an (m, k) array of
+    inputs to m outputs.
+    """
+    k = len(bounds)
+    low, high = bounds[:, 0], bounds[:, 1]
+    a = low + (high - low) * rng.random((n_samples, k))
+    b = low + (high - low) * rng.random((n_samples, k))
+    
+    # Stack A, B and every AB_i so the model runs once over all rows
+    ab = np.repeat(a[np.newaxis], k, axis=0)
+    idx = np.arange(k)
+    ab[idx, :, idx] = b[:, idx].T
+    y = evaluate(np.concatenate([a, b, ab.reshape(-1, k)]))
+    # Centring the output cuts the variance of the first-order estimator
+    y = y - y[:2 * n_samples].mean()
+    y_a, y_b = y[:n_samples], y[n_samples:2 * n_samples]
+    y_ab = y[2 * n_samples:].reshape(k, n_samples)
+    
+    variance = np.var(np.concatenate([y_a, y_b]))
+    if variance == 0:
+        return np.zeros(k), np.zeros(k)
+    s1 = np.mean(y_b * (y_ab - y_a), axis=1) / variance
+    st = 0.5 * np.mean((y_a - y_ab) ** 2, axis=1) / variance
+    return s1, st
+
+
+def _make_patcher(
+    modifications: Dict[str, Any]
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a function that applies template modifications to parameters.
+    
+    Value types are sorted out once here: dict values are merged into an
+    existing dict (or copied in), everything else is set in one update.
+    """
+    nested = tuple(
+        (key, value) for key, value in modifications.items() if isinstance(value, dict)
+    )
+    scalars = {
+        key: value for key, value in modifications.items() if not isinstance(value, dict)
+    }
+    
+    def patch(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in nested:
+            current = parameters.get(key)
+            if isinstance(current, dict):
+                current.update(value)
+            else:
+                # Copy so scenario edits never reach the template
+                parameters[key] = dict(value)
+        parameters.update(scalars)
+        return parameters
+    
+    return patch
+
+
+def _clone_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a parameter dict so scenario edits don't touch the original.
+    
+    Only nested dicts (e.g. energy_mix) are copied; other values are
+    shared, since template and candidate edits only ever replace them
+    or update nested dicts in place.
+    """
+    return {
+        key: _clone_params(value) if isinstance(value, dict) else value
+        for key, value in params.items()
+    }
+
+
+def _intern_keys(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a parameter dict with its string keys interned.
+    
+    Keys parsed from JSON input are fresh string objects; interning
+    them lets every scenario built from the same input share one copy
+    of each key and lets lookups with literal keys match by identity.
+    """
+    return {
+        (sys.intern(key) if isinstance(key, str) else key):
+            _intern_keys(value) if isinstance(value, dict) else value
+        for key, value in params.items()
+    }
+
 
 class ScenarioAgentV2(BaseCircuMetalAgent):
     """
@@ -82,6 +226,44 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             }
         }
     }
+    
+    # Template patch functions and the template listing, precomputed
+    # since TEMPLATES is constant
+    _TEMPLATE_PATCHERS: ClassVar[Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+        tid: _make_patcher(template["modifications"])
+        for tid, template in TEMPLATES.items()
+    }
+    _TEMPLATE_LIST: ClassVar[Tuple[Dict[str, Any], ...]] = tuple(
+        {
+            "id": tid,
+            "name": template["name"],
+            "description": template["description"],
+            "modifications": list(template["modifications"])
+        }
+        for tid, template in TEMPLATES.items()
+    )
+    
+    # GWP multipliers for technology levels used in LCA estimates
+    TECH_FACTORS: ClassVar[Dict[str, float]] = {
+        "conventional": 1.0,
+        "best_available": 0.85,
+        "advanced": 0.7
+    }
+    
+    # Total GWP spread (kg CO2e) below which scenarios count as identical
+    GWP_TIE_TOLERANCE: ClassVar[float] = 1e-6
+    
+    # Maximum concurrent LCA service calls per agent
+    MAX_CONCURRENT_LCA: ClassVar[int] = 8
+    
+    # Maximum number of cached LCA service results
+    LCA_CACHE_SIZE: ClassVar[int] = 512
+    
+    # Maximum number of generated scenarios kept for later comparison
+    MAX_STORED_SCENARIOS: ClassVar[int] = 1024
+    
+    # Upper bound on Sobol model evaluations, (parameters + 2) per sample
+    MAX_SOBOL_EVALUATIONS: ClassVar[int] = 200_000
 
     def __init__(
         self,
@@ -95,8 +277,11 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             service_config=service_config
         )
         
-        # Store active scenarios
-        self._scenarios: Dict[str, Dict] = {}
+        # Store active scenarios (LRU)
+        self._scenarios: "OrderedDict[str, Dict]" = OrderedDict()
+        
+        # Bounds concurrent LCA service calls
+        self._lca_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_LCA)
 
     async def _async_handle(
         self,
@@ -129,7 +314,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         run_id: str
     ) -> Dict[str, Any]:
         """Generate scenarios from baseline."""
-        baseline = input_data.get("baseline", {})
+        baseline = _intern_keys(input_data.get("baseline", {}))
         template_ids = input_data.get("templates", ["renewable_energy", "high_recycling"])
         custom_scenarios = input_data.get("custom_scenarios", [])
         
@@ -153,17 +338,24 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         
         # Add custom scenarios
         for idx, custom in enumerate(custom_scenarios):
+            # Custom modifications replace baseline values wholesale, so a
+            # full energy_mix is taken as given rather than merged
+            parameters = _clone_params(baseline)
+            parameters.update(_intern_keys(custom.get("modifications") or {}))
             scenario = {
                 "id": custom.get("id", f"custom_{idx + 1}"),
                 "name": custom.get("name", f"Custom Scenario {idx + 1}"),
                 "description": custom.get("description", ""),
-                "parameters": {**baseline, **custom.get("modifications", {})}
+                "parameters": parameters
             }
             scenarios.append(scenario)
         
-        # Calculate LCA for each scenario
-        for scenario in scenarios:
-            lca_result = await self._calculate_scenario_lca(scenario["parameters"])
+        # Calculate LCA for all scenarios concurrently
+        lca_results = await self._calculate_scenario_lcas(
+            [scenario["parameters"] for scenario in scenarios]
+        )
+        
+        for scenario, lca_result in zip(scenarios, lca_results):
             scenario["lca_results"] = lca_result
         
         provenance.append(self._create_provenance(
@@ -173,7 +365,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         
         # Store scenarios
         for s in scenarios:
-            self._scenarios[s["id"]] = s
+            self._store_scenario(s)
         
         return {
             "status": "success",
@@ -188,6 +380,15 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             "run_id": run_id
         }
 
+    def _store_scenario(self, scenario: Dict[str, Any]):
+        """Store a scenario, evicting the least recently used past the cap."""
+        sid = scenario["id"]
+        if sid in self._scenarios:
+            self._scenarios.move_to_end(sid)
+        self._scenarios[sid] = scenario
+        if len(self._scenarios) > self.MAX_STORED_SCENARIOS:
+            self._scenarios.popitem(last=False)
+
     async def _compare_scenarios(
         self,
         input_data: Dict[str, Any],
@@ -204,6 +405,8 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
                 self._scenarios[sid] for sid in scenario_ids 
                 if sid in self._scenarios
             ]
+            for s in scenarios:
+                self._scenarios.move_to_end(s["id"])
         
         if len(scenarios) < 2:
             return {
@@ -213,23 +416,45 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
                 "confidence": 0.0
             }
         
+        # LCA results per scenario, looked up once and shared below
+        lcas = [s.get("lca_results", {}) for s in scenarios]
+        
         # Extract comparison metrics
-        comparison = self._extract_comparison_metrics(scenarios)
+        comparison = self._extract_comparison_metrics(
+            scenarios,
+            ranking_limit=input_data.get("ranking_limit"),
+            lcas=lcas
+        )
         
         # Find best scenario
-        best = min(scenarios, key=lambda s: s.get("lca_results", {}).get("total_gwp", float("inf")))
+        total_gwps = [lca.get("total_gwp", float("inf")) for lca in lcas]
+        best_idx = min(range(len(scenarios)), key=total_gwps.__getitem__)
+        best = scenarios[best_idx]
         
         # Calculate improvement from baseline
-        baseline = next((s for s in scenarios if s["id"] == "baseline"), scenarios[0])
-        baseline_gwp = baseline.get("lca_results", {}).get("total_gwp", 0)
-        best_gwp = best.get("lca_results", {}).get("total_gwp", 0)
+        baseline_idx = next(
+            (i for i, s in enumerate(scenarios) if s["id"] == "baseline"), 0
+        )
+        baseline_gwp = lcas[baseline_idx].get("total_gwp", 0)
+        best_gwp = lcas[best_idx].get("total_gwp", 0)
         
         improvement = 0
         if baseline_gwp > 0:
             improvement = (baseline_gwp - best_gwp) / baseline_gwp * 100
         
-        # Get LLM analysis
-        analysis = await self._analyze_scenarios(scenarios, comparison)
+        # Get LLM analysis, unless GWP gives it nothing to tell apart
+        gwp_values = np.array(total_gwps, dtype=float)
+        finite = gwp_values[np.isfinite(gwp_values)]
+        if finite.size == 0 or (
+            finite.size == gwp_values.size
+            and np.ptp(finite) < self.GWP_TIE_TOLERANCE
+        ):
+            analysis = {
+                "analysis": "Scenarios indistinguishable by GWP",
+                "recommendations": []
+            }
+        else:
+            analysis = await self._analyze_scenarios(scenarios, comparison)
         
         provenance.append(self._create_provenance(
             source="scenario_comparator",
@@ -267,21 +492,46 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         baseline = input_data.get("baseline", {})
         parameters = input_data.get("parameters", ["recycled_content", "renewable_share"])
         variation_range = input_data.get("variation_percent", 20)
+        method = input_data.get("method", "one_at_a_time")
         
-        sensitivity_results = {}
-        
-        for param in parameters:
-            param_results = await self._analyze_parameter_sensitivity(
+        if method == "sobol":
+            n_samples = _sample_count(
+                input_data.get("samples", 1024),
+                max(2, self.MAX_SOBOL_EVALUATIONS // (len(parameters) + 2))
+            )
+            if n_samples is None:
+                return {
+                    "status": "failure",
+                    "data": {},
+                    "log": f"samples must be an integer of at least 2, got {input_data.get('samples')!r}",
+                    "confidence": 0.0,
+                    "run_id": run_id
+                }
+            sensitivity_results = self._sobol_sensitivity(
                 baseline=baseline,
-                parameter=param,
-                variation_percent=variation_range
+                parameters=parameters,
+                variation_percent=variation_range,
+                n_samples=n_samples,
+                seed=input_data.get("seed")
             )
-            sensitivity_results[param] = param_results
+            score_key = "ST"
+        else:
+            # Sweep all parameters concurrently; the LCA semaphore bounds the load
+            param_results = await asyncio.gather(*(
+                self._analyze_parameter_sensitivity(
+                    baseline=baseline,
+                    parameter=param,
+                    variation_percent=variation_range
+                )
+                for param in parameters
+            ))
+            sensitivity_results = dict(zip(parameters, param_results))
+            score_key = "sensitivity_score"
         
         # Rank parameters by sensitivity
         ranking = sorted(
             sensitivity_results.items(),
-            key=lambda x: x[1].get("sensitivity_score", 0),
+            key=lambda x: x[1].get(score_key, 0),
             reverse=True
         )
         
@@ -296,6 +546,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
                 "baseline": baseline,
                 "parameters_analyzed": parameters,
                 "variation_range_percent": variation_range,
+                "method": method,
                 "sensitivity_results": sensitivity_results,
                 "parameter_ranking": [p[0] for p in ranking],
                 "most_sensitive": ranking[0][0] if ranking else None
@@ -313,7 +564,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         run_id: str
     ) -> Dict[str, Any]:
         """Find optimal scenario configuration."""
-        baseline = input_data.get("baseline", {})
+        baseline = _intern_keys(input_data.get("baseline", {}))
         target_gwp_reduction = input_data.get("target_gwp_reduction_percent", 30)
         constraints = input_data.get("constraints", {})
         
@@ -324,15 +575,20 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             constraints=constraints
         )
         
-        # Evaluate each candidate
-        for candidate in candidates:
-            lca_result = await self._calculate_scenario_lca(candidate["parameters"])
-            candidate["lca_results"] = lca_result
-        
-        # Find optimal
         baseline_gwp = baseline.get("baseline_gwp", 2000)
         target_gwp = baseline_gwp * (1 - target_gwp_reduction / 100)
         
+        # Evaluate all candidates concurrently
+        if input_data.get("stop_at_first_feasible", False):
+            await self._evaluate_until_feasible(candidates, target_gwp)
+        else:
+            lca_results = await self._calculate_scenario_lcas(
+                [candidate["parameters"] for candidate in candidates]
+            )
+            for candidate, lca_result in zip(candidates, lca_results):
+                candidate["lca_results"] = lca_result
+        
+        # Find optimal
         feasible = [c for c in candidates if c.get("lca_results", {}).get("gwp_per_tonne", float("inf")) <= target_gwp]
         
         if feasible:
@@ -364,20 +620,40 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             "run_id": run_id
         }
 
+    async def _evaluate_until_feasible(
+        self,
+        candidates: List[Dict[str, Any]],
+        target_gwp: float
+    ):
+        """
+        Evaluate candidates concurrently, stopping at the first one that
+        meets target_gwp. Candidates still pending are cancelled and left
+        without lca_results.
+        """
+        async def evaluate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+            candidate["lca_results"] = (
+                await self._calculate_scenario_lcas([candidate["parameters"]])
+            )[0]
+            return candidate
+        
+        tasks = [asyncio.create_task(evaluate(c)) for c in candidates]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                candidate = await next_done
+                if candidate["lca_results"].get("gwp_per_tonne", float("inf")) <= target_gwp:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def _list_templates(
         self,
         provenance: List[Dict],
         run_id: str
     ) -> Dict[str, Any]:
         """List available scenario templates."""
-        templates = []
-        for tid, template in self.TEMPLATES.items():
-            templates.append({
-                "id": tid,
-                "name": template["name"],
-                "description": template["description"],
-                "modifications": list(template["modifications"].keys())
-            })
+        # Entries are shared between calls and must be treated as read-only
+        templates = list(self._TEMPLATE_LIST)
         
         return {
             "status": "success",
@@ -398,13 +674,10 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         template_id: str
     ) -> Dict[str, Any]:
         """Apply a template to baseline to create scenario."""
-        parameters = deepcopy(baseline)
-        
-        for key, value in template["modifications"].items():
-            if isinstance(value, dict) and isinstance(parameters.get(key), dict):
-                parameters[key].update(value)
-            else:
-                parameters[key] = value
+        patch = self._TEMPLATE_PATCHERS.get(template_id)
+        if patch is None:
+            patch = _make_patcher(template["modifications"])
+        parameters = patch(_clone_params(baseline))
         
         return {
             "id": template_id,
@@ -418,41 +691,77 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         parameters: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Calculate LCA for scenario parameters."""
+        request = {
+            "metal_type": parameters.get("metal_type", "steel"),
+            "production_route": parameters.get("production_route", "bf_bof"),
+            "production_volume": parameters.get("production_volume", 100000),
+            "recycled_content": parameters.get("recycled_content", 0.0),
+            "energy_mix": parameters.get("energy_mix", {}),
+            "location": parameters.get("location", "IN")
+        }
+        
+        key = hashlib.blake2b(
+            fast_json.dumps(request, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
+        with _LCA_CACHE_LOCK:
+            cached = _LCA_CACHE.get(key)
+            if cached is not None:
+                _LCA_CACHE.move_to_end(key)
+        if cached is not None:
+            return cached
+        
         try:
-            result = await self.call_service(
-                service="lca",
-                endpoint="/lca/quick",
-                method="POST",
-                data={
-                    "metal_type": parameters.get("metal_type", "steel"),
-                    "production_route": parameters.get("production_route", "bf_bof"),
-                    "production_volume": parameters.get("production_volume", 100000),
-                    "recycled_content": parameters.get("recycled_content", 0.0),
-                    "energy_mix": parameters.get("energy_mix", {}),
-                    "location": parameters.get("location", "IN")
-                }
-            )
+            async with self._lca_semaphore:
+                result = await self.call_service(
+                    service="lca",
+                    endpoint="/lca/quick",
+                    method="POST",
+                    data=request
+                )
+            
+            # Only cache successful results so failures are retried
+            if "error" not in result:
+                with _LCA_CACHE_LOCK:
+                    _LCA_CACHE[key] = result
+                    if len(_LCA_CACHE) > self.LCA_CACHE_SIZE:
+                        _LCA_CACHE.popitem(last=False)
             return result
         except Exception as e:
             logger.warning(f"LCA service call failed: {e}")
-            # Return estimated values
-            return self._estimate_lca(parameters)
+            # Callers estimate failed calculations together
+            return {"status": "error", "error": str(e)}
+
+    async def _calculate_scenario_lcas(
+        self,
+        parameter_sets: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate LCA for many scenarios concurrently. Any the service could
+        not calculate are estimated together in one batch.
+        """
+        lca_results = list(await asyncio.gather(
+            *(self._calculate_scenario_lca(parameters) for parameters in parameter_sets)
+        ))
+        
+        failed = [i for i, result in enumerate(lca_results) if "error" in result]
+        if failed:
+            estimates = self._estimate_lca_batch([parameter_sets[i] for i in failed])
+            for i, estimate in zip(failed, estimates):
+                lca_results[i] = estimate
+        return lca_results
 
     def _estimate_lca(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Estimate LCA when service unavailable."""
-        base_ef = 1800  # kg CO2e/tonne for steel
-        
         recycled = parameters.get("recycled_content", 0.0)
-        recycled_savings = recycled * 0.75
         
         energy = parameters.get("energy_mix", {})
         renewable = energy.get("renewable", 0.1)
-        energy_savings = renewable * 0.5
         
         tech = parameters.get("technology_level", "conventional")
-        tech_factor = {"conventional": 1.0, "best_available": 0.85, "advanced": 0.7}.get(tech, 1.0)
+        tech_factor = self.TECH_FACTORS.get(tech, 1.0)
         
-        gwp = base_ef * (1 - recycled_savings) * (1 - energy_savings) * tech_factor
+        gwp = _estimate_gwp_per_tonne(recycled, renewable, tech_factor)
         
         return {
             "gwp_per_tonne": gwp,
@@ -460,45 +769,79 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             "method": "estimated"
         }
 
+    def _estimate_lca_batch(
+        self,
+        parameter_sets: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Estimate LCA for many scenarios at once (same model as _estimate_lca)."""
+        n = len(parameter_sets)
+        recycled = np.fromiter(
+            (p.get("recycled_content", 0.0) for p in parameter_sets), dtype=np.float64, count=n
+        )
+        renewable = np.fromiter(
+            (p.get("energy_mix", {}).get("renewable", 0.1) for p in parameter_sets),
+            dtype=np.float64,
+            count=n
+        )
+        tech_factor = np.fromiter(
+            (self.TECH_FACTORS.get(p.get("technology_level", "conventional"), 1.0) for p in parameter_sets),
+            dtype=np.float64,
+            count=n
+        )
+        volume = np.fromiter(
+            (p.get("production_volume", 100000) for p in parameter_sets), dtype=np.float64, count=n
+        )
+        
+        gwp = _estimate_gwp_per_tonne(recycled, renewable, tech_factor)
+        total = gwp * volume
+        
+        return [
+            {"gwp_per_tonne": g, "total_gwp": t, "method": "estimated"}
+            for g, t in zip(gwp.tolist(), total.tolist())
+        ]
+
     def _extract_comparison_metrics(
         self,
-        scenarios: List[Dict[str, Any]]
+        scenarios: List[Dict[str, Any]],
+        ranking_limit: Optional[int] = None,
+        lcas: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
-        """Extract comparison metrics from scenarios."""
-        metrics = {
-            "gwp": [],
-            "recycled_content": [],
-            "renewable_share": []
+        """
+        Extract comparison metrics from scenarios.
+        
+        If ranking_limit is given, only that many of the lowest-GWP
+        scenarios are ranked. lcas may pass in each scenario's LCA
+        results when the caller has already looked them up.
+        """
+        ids = [s["id"] for s in scenarios]
+        if lcas is None:
+            lcas = [s.get("lca_results", {}) for s in scenarios]
+        params = [s.get("parameters", {}) for s in scenarios]
+        
+        # One column per metric; ranking uses inf for scenarios without results
+        gwp = np.array([lca.get("gwp_per_tonne", np.inf) for lca in lcas], dtype=np.float64)
+        columns = {
+            "gwp": [lca.get("gwp_per_tonne", 0) for lca in lcas],
+            "recycled_content": [p.get("recycled_content", 0) for p in params],
+            "renewable_share": [p.get("energy_mix", {}).get("renewable", 0) for p in params]
         }
         
-        for s in scenarios:
-            lca = s.get("lca_results", {})
-            params = s.get("parameters", {})
-            
-            metrics["gwp"].append({
-                "scenario": s["id"],
-                "value": lca.get("gwp_per_tonne", 0)
-            })
-            metrics["recycled_content"].append({
-                "scenario": s["id"],
-                "value": params.get("recycled_content", 0)
-            })
-            
-            energy = params.get("energy_mix", {})
-            metrics["renewable_share"].append({
-                "scenario": s["id"],
-                "value": energy.get("renewable", 0)
-            })
+        metrics = {
+            name: [{"scenario": sid, "value": value} for sid, value in zip(ids, values)]
+            for name, values in columns.items()
+        }
         
-        # Create ranking by GWP
-        ranking = sorted(
-            [(s["id"], s.get("lca_results", {}).get("gwp_per_tonne", float("inf"))) for s in scenarios],
-            key=lambda x: x[1]
-        )
+        # Create ranking by GWP (stable, so ties keep input order); a
+        # partial ranking avoids sorting every scenario
+        if ranking_limit is not None and ranking_limit < len(ids):
+            order = heapq.nsmallest(ranking_limit, range(len(ids)), key=gwp.__getitem__)
+        else:
+            order = np.argsort(gwp, kind="stable").tolist()
+        ranking = [ids[i] for i in order]
         
         return {
             "metrics": metrics,
-            "ranking": [r[0] for r in ranking]
+            "ranking": ranking
         }
 
     async def _analyze_parameter_sensitivity(
@@ -517,12 +860,18 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         low_value = baseline_value * (1 - variation_percent / 100)
         high_value = min(1.0, baseline_value * (1 + variation_percent / 100))
         
-        # Calculate LCA for each
-        results = {}
-        for label, value in [("low", low_value), ("baseline", baseline_value), ("high", high_value)]:
-            params = deepcopy(baseline)
+        # Calculate LCA for each variation concurrently
+        variations = [("low", low_value), ("baseline", baseline_value), ("high", high_value)]
+        variation_params = []
+        for _, value in variations:
+            params = _clone_params(baseline)
             self._set_nested_value(params, parameter, value)
-            lca = await self._calculate_scenario_lca(params)
+            variation_params.append(params)
+        
+        lcas = await self._calculate_scenario_lcas(variation_params)
+        
+        results = {}
+        for (label, value), lca in zip(variations, lcas):
             results[label] = {
                 "parameter_value": value,
                 "gwp": lca.get("gwp_per_tonne", 0)
@@ -543,11 +892,71 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
             "gwp_range": gwp_range
         }
 
+    def _sobol_sensitivity(
+        self,
+        baseline: Dict[str, Any],
+        parameters: List[str],
+        variation_percent: float,
+        n_samples: int,
+        seed: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Variance-based (Sobol) sensitivity of the estimated GWP.
+        
+        Each parameter varies uniformly over the same low/high range as
+        the one-at-a-time sweep. Runs on the local estimation model, since
+        the sample count is far too large for per-row service calls.
+        """
+        bounds = []
+        for param in parameters:
+            value = self._get_nested_value(baseline, param)
+            if value is None:
+                value = 0.5
+            bounds.append((
+                value * (1 - variation_percent / 100),
+                min(1.0, value * (1 + variation_percent / 100))
+            ))
+        bounds = np.array(bounds, dtype=np.float64)
+        
+        # The estimation model only reads these inputs, so samples are fed
+        # to it column by column rather than patched into a dict per row
+        model_inputs = {
+            "recycled_content": baseline.get("recycled_content", 0.0),
+            "energy_mix.renewable": baseline.get("energy_mix", {}).get("renewable", 0.1)
+        }
+        tech_factor = self.TECH_FACTORS.get(baseline.get("technology_level", "conventional"), 1.0)
+        
+        def evaluate(x: np.ndarray) -> np.ndarray:
+            columns = {
+                name: np.full(len(x), value, dtype=np.float64)
+                for name, value in model_inputs.items()
+            }
+            for col, param in enumerate(parameters):
+                if param in columns:
+                    columns[param] = x[:, col]
+            return _estimate_gwp_per_tonne(
+                columns["recycled_content"], columns["energy_mix.renewable"], tech_factor
+            )
+        
+        s1, st = _sobol_indices(evaluate, bounds, n_samples, np.random.default_rng(seed))
+        
+        return {
+            param: {
+                "parameter": param,
+                "low_value": low,
+                "high_value": high,
+                "S1": s1_i,
+                "ST": st_i
+            }
+            for param, (low, high), s1_i, st_i in zip(
+                parameters, bounds.tolist(), s1.tolist(), st.tolist()
+            )
+        }
+
     def _get_nested_value(self, d: Dict, key: str) -> Any:
         """Get value from nested dict using dot notation."""
-        keys = key.split(".")
         value = d
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(value, dict):
                 value = value.get(k)
             else:
@@ -556,10 +965,15 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
 
     def _set_nested_value(self, d: Dict, key: str, value: Any):
         """Set value in nested dict using dot notation."""
-        keys = key.split(".")
-        for k in keys[:-1]:
-            d = d.setdefault(k, {})
-        d[keys[-1]] = value
+        *parents, last = _split_key(key)
+        for k in parents:
+            if k in d:
+                d = d[k]
+            else:
+                child = {}
+                d[k] = child
+                d = child
+        d[last] = value
 
     def _generate_optimization_candidates(
         self,
@@ -571,7 +985,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         candidates = []
         
         # Candidate 1: Increase recycled content
-        c1 = deepcopy(baseline)
+        c1 = _clone_params(baseline)
         c1["recycled_content"] = min(0.8, c1.get("recycled_content", 0) + 0.3)
         candidates.append({
             "name": "Increased Recycling",
@@ -580,7 +994,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         })
         
         # Candidate 2: Renewable energy
-        c2 = deepcopy(baseline)
+        c2 = _clone_params(baseline)
         c2["energy_mix"] = {"coal": 0.2, "natural_gas": 0.2, "renewable": 0.5, "nuclear": 0.1}
         candidates.append({
             "name": "Renewable Energy",
@@ -589,7 +1003,7 @@ class ScenarioAgentV2(BaseCircuMetalAgent):
         })
         
         # Candidate 3: Combined approach
-        c3 = deepcopy(baseline)
+        c3 = _clone_params(baseline)
         c3["recycled_content"] = min(0.6, c3.get("recycled_content", 0) + 0.2)
         c3["energy_mix"] = {"coal": 0.3, "natural_gas": 0.2, "renewable": 0.4, "nuclear": 0.1}
         c3["technology_level"] = "best_available"
@@ -6,19 +6,169 @@ for LCA results.
 """
 
 import os
-import json
+import asyncio
+import hashlib
 import logging
-from typing import Any, ClassVar, Dict, List, Optional
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Optional, Tuple
 from datetime import datetime
 import base64
 
 from circu_metal.agents.base_agent import BaseCircuMetalAgent, ServiceConfig
+from circu_metal.utils import fast_json
 
 # Import database function (lazy import inside method to avoid circular dependency if needed)
 # from api.database import save_visualization
 
 logger = logging.getLogger(__name__)
 
+# LLM chart data and HTML diagrams keyed by input hash (LRU). Kept at
+# module level because callers build a new agent for each request
+_CHART_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+_CHART_CACHE_LOCK = threading.Lock()
+
+# Markdown code fence wrapping a whole LLM response
+_FENCE_RE = re.compile(r"\A```(?:html)?\n?|\n?```\Z")
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a markdown code fence wrapped around an LLM response."""
+    return _FENCE_RE.sub("", text)
+
+
+# Narrative fields of LCA results that carry no chart data
+_PROSE_KEYS = frozenset({
+    "interpretation", "analysis", "recommendations", "key_takeaways",
+    "report_markdown", "explanation", "narrative", "provenance", "log"
+})
+_MAX_TEXT_CHARS = 200
+_MAX_LIST_ITEMS = 50
+
+
+def _slim_lca(value: Any) -> Any:
+    """
+    Cut LCA results down to chart-relevant data before it goes into a
+    prompt: narrative fields are dropped, long strings truncated and long
+    lists capped.
+    """
+    if isinstance(value, dict):
+        return {
+            key: _slim_lca(item) for key, item in value.items()
+            if key not in _PROSE_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_slim_lca(item) for item in value[:_MAX_LIST_ITEMS]]
+    if isinstance(value, str) and len(value) > _MAX_TEXT_CHARS:
+        return value[:_MAX_TEXT_CHARS] + "..."
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _impact_breakdowns(lca: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Per-stage impact breakdowns in the LCA service's schema, as
+    [{"category", "unit", "breakdown"}]. Looks in "impacts" first, then
+    "process_contributions" (GWP only), then a flat numeric "breakdown"
+    (GWP only), also one level down under "results".
+    """
+    impacts = lca.get("impacts")
+    if isinstance(impacts, list):
+        found = [
+            {
+                "category": str(item.get("category", "impact")),
+                "unit": item.get("unit", ""),
+                "breakdown": item["breakdown"]
+            }
+            for item in impacts
+            if isinstance(item, dict) and isinstance(item.get("breakdown"), dict)
+            and item["breakdown"] and all(_is_number(v) for v in item["breakdown"].values())
+        ]
+        if found:
+            return found
+    
+    contributions = lca.get("process_contributions")
+    if isinstance(contributions, dict) and contributions and all(
+        isinstance(c, dict) and _is_number(c.get("gwp")) for c in contributions.values()
+    ):
+        return [{
+            "category": "gwp",
+            "unit": "kg CO2e",
+            "breakdown": {stage: c["gwp"] for stage, c in contributions.items()}
+        }]
+    
+    breakdown = lca.get("breakdown")
+    if isinstance(breakdown, dict) and breakdown and all(_is_number(v) for v in breakdown.values()):
+        return [{"category": "gwp", "unit": "kg CO2e", "breakdown": breakdown}]
+    
+    results = lca.get("results")
+    if isinstance(results, dict):
+        return _impact_breakdowns(results)
+    return []
+
+
+def _extract_impact_breakdown(lca: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Bar chart data (stages x impact categories), or None if lca has no breakdowns."""
+    breakdowns = _impact_breakdowns(lca)
+    if not breakdowns:
+        return None
+    
+    labels = list(dict.fromkeys(stage for b in breakdowns for stage in b["breakdown"]))
+    return {
+        "labels": labels,
+        "datasets": [
+            {
+                "label": f"{b['category']} ({b['unit']})" if b["unit"] else b["category"],
+                "data": [b["breakdown"].get(stage, 0) for stage in labels]
+            }
+            for b in breakdowns
+        ]
+    }
+
+
+def _extract_sankey(lca: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Sankey data with each stage's GWP flowing into a total node, or None
+    if lca has no GWP breakdown.
+    """
+    gwp = next(
+        (b for b in _impact_breakdowns(lca) if b["category"].lower().endswith("gwp")), None
+    )
+    if gwp is None:
+        return None
+    
+    total = f"Total GWP ({gwp['unit']})" if gwp["unit"] else "Total GWP"
+    links = [
+        {"source": stage, "target": total, "value": value}
+        for stage, value in gwp["breakdown"].items()
+        if value > 0
+    ]
+    if not links:
+        return None
+    return {
+        "nodes": [link["source"] for link in links] + [total],
+        "links": links
+    }
+
+
+def _metric_vector(value: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten the numeric leaves of a nested dict into dotted-path metrics."""
+    metrics = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _PROSE_KEYS:
+                continue
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(item, dict):
+                metrics.update(_metric_vector(item, path))
+            elif isinstance(item, (int, float)) and not isinstance(item, bool):
+                metrics[path] = item
+    return metrics
+
 
 class VisualizationAgent(BaseCircuMetalAgent):
     """
@@ -51,6 +201,65 @@ class VisualizationAgent(BaseCircuMetalAgent):
         "traffic_light": ["#D32F2F", "#FBC02D", "#388E3C"],
         "sequential": ["#E3F2FD", "#90CAF9", "#42A5F5", "#1976D2", "#0D47A1"]
     }
+    
+    # Maximum number of cached LLM chart and diagram results
+    CHART_CACHE_SIZE: ClassVar[int] = 128
+    
+    # Prompt templates, filled with str.format at call time
+    _SANKEY_DATA_PROMPT: ClassVar[str] = """
+        Extract nodes and links for a Sankey diagram from this LCA data.
+        Return JSON with 'nodes' (list of names) and 'links' (source, target, value).
+        
+        Data: {data}
+        """
+    _IMPACT_PROMPT: ClassVar[str] = """
+        Extract environmental impact breakdown data for a bar chart.
+        Return JSON with 'labels' (impact categories) and 'datasets' (values).
+        
+        Data: {data}
+        """
+    _COMPARISON_PROMPT: ClassVar[str] = """
+        Compare the baseline LCA results with these scenarios.
+        Return JSON for a radar chart with 'labels' (metrics) and 'datasets' (one for baseline, one for each scenario).
+        
+        Baseline: {baseline}
+        Scenarios: {scenarios}
+        """
+    _SANKEY_HTML_PROMPT: ClassVar[str] = """
+        Generate a complete, self-contained HTML file with D3.js code to visualize a Sankey diagram 
+        for the lifecycle of {metal_name}.
+        
+        LCA Data:
+        {data}
+        
+        Requirements:
+        - Use D3.js v7 (CDN link).
+        - The diagram should show flows from Raw Material -> Processing -> Manufacturing -> Use -> End of Life.
+        - Include recycling loops back to earlier stages.
+        - Use a modern, clean color scheme.
+        - Make it responsive.
+        - Return ONLY the HTML code, starting with <!DOCTYPE html>.
+        """
+    _SANKEY_HTML_SYSTEM: ClassVar[str] = (
+        "You are a D3.js visualization expert. Generate complete, working HTML files with embedded D3.js code. Return only the HTML code without any markdown formatting or explanations."
+    )
+    _FLOWCHART_HTML_PROMPT: ClassVar[str] = """
+        Generate a complete, self-contained HTML file with Mermaid.js to visualize a process flowchart 
+        for the lifecycle of {metal_name}.
+        
+        LCA Data:
+        {data}
+        
+        Requirements:
+        - Use Mermaid.js (CDN link).
+        - Create a 'graph LR' (Left to Right) flowchart.
+        - Show the main process steps and decision points.
+        - Style the nodes to look professional.
+        - Return ONLY the HTML code, starting with <!DOCTYPE html>.
+        """
+    _FLOWCHART_HTML_SYSTEM: ClassVar[str] = (
+        "You are a Mermaid.js visualization expert. Generate complete, working HTML files with embedded Mermaid.js diagrams. Return only the HTML code without any markdown formatting or explanations."
+    )
 
     def __init__(
         self,
@@ -64,6 +273,61 @@ class VisualizationAgent(BaseCircuMetalAgent):
             service_config=service_config
         )
 
+    def _cache_key(self, kind: str, *parts: Any) -> str:
+        """Cache key for a chart kind, the model and the data it was generated from."""
+        canonical = fast_json.dumps([kind, self.model, *parts], sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+    async def _cached(self, key: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached result for key, or produce and cache it.
+        Empty or unparseable results are not cached so failed
+        generations are retried.
+        """
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        result = await produce()
+        self._cache_put(key, result)
+        return result
+
+    def _cache_get(self, key: str) -> Any:
+        with _CHART_CACHE_LOCK:
+            cached = _CHART_CACHE.get(key)
+            if cached is not None:
+                _CHART_CACHE.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: str, result: Any):
+        if result and not (isinstance(result, dict) and result.get("status") == "parse_error"):
+            with _CHART_CACHE_LOCK:
+                _CHART_CACHE[key] = result
+                if len(_CHART_CACHE) > self.CHART_CACHE_SIZE:
+                    _CHART_CACHE.popitem(last=False)
+
+    async def _resolve_charts(self, plans: List[Tuple[Any, Optional[str], Optional[str]]]) -> List[Any]:
+        """
+        Resolve (result, cache key, prompt) chart plans. Plans without a
+        result are served from the cache, and the rest are sent to the LLM
+        together as one batched request.
+        """
+        results = [result for result, _, _ in plans]
+        pending = []
+        for idx, (result, key, _) in enumerate(plans):
+            if result is not None or key is None:
+                continue
+            results[idx] = self._cache_get(key)
+            if results[idx] is None:
+                pending.append(idx)
+        
+        if pending:
+            responses = await self.run_llm_batch([{"prompt": plans[idx][2]} for idx in pending])
+            for idx, response in zip(pending, responses):
+                results[idx] = await self._aparse_llm_response(response)
+                self._cache_put(plans[idx][1], results[idx])
+        return results
+
     async def _async_handle(
         self,
         input_data: Dict[str, Any],
@@ -94,51 +358,64 @@ class VisualizationAgent(BaseCircuMetalAgent):
     ) -> Dict[str, Any]:
         """Generate chart specifications for LCA results."""
         lca_results = input_data.get("lca_results", {})
-        chart_types = input_data.get("chart_types", ["bar", "pie", "gauge"])
+        chart_types = input_data.get("chart_types", ["sankey", "bar", "pie", "gauge"])
         
-        charts = []
+        # Slimmed and serialized once, then shared by the chart prompts
+        lca_json = fast_json.dumps(_slim_lca(lca_results))
         
-        # 1. Generate Sankey Diagram (Flow)
-        if "sankey" in chart_types or True:  # Always try to generate Sankey
-            sankey_data = await self._generate_sankey_data(lca_results, input_data)
-            if sankey_data:
-                charts.append({
-                    "id": "sankey_flow",
-                    "type": "sankey",
-                    "title": "Material and Energy Flow",
-                    "data": sankey_data,
-                    "library": "d3"
-                })
-                
-                # Save visualization to DB
-                await self._generate_and_save_diagrams(input_data, lca_results)
-
-        # 2. Generate Impact Breakdown (Bar/Pie)
-        if "bar" in chart_types:
-            impact_data = await self._generate_impact_breakdown(lca_results)
-            if impact_data:
-                charts.append({
-                    "id": "impact_breakdown",
-                    "type": "bar",
-                    "title": "Environmental Impact Breakdown",
-                    "data": impact_data,
-                    "library": "chart.js"
-                })
-
-        # 3. Generate Scenario Comparison (Radar/Bar)
-        if "radar" in chart_types and "scenarios" in input_data:
-            comparison_data = await self._generate_scenario_comparison(
-                lca_results, 
-                input_data["scenarios"]
-            )
-            if comparison_data:
-                charts.append({
-                    "id": "scenario_comparison",
-                    "type": "radar",
-                    "title": "Scenario Comparison",
-                    "data": comparison_data,
-                    "library": "chart.js"
-                })
+        # HTML diagrams are saved by default (opt out with
+        # save_html_diagrams=False) and need a project to be saved to
+        save_diagrams = bool(
+            input_data.get("save_html_diagrams", True)
+            and self._resolve_project_id(input_data)
+        )
+        
+        skip = (None, None, None)
+        plans = [
+            # 1. Sankey Diagram (Flow)
+            self._sankey_plan(lca_results, lca_json) if "sankey" in chart_types else skip,
+            # 2. Impact Breakdown (Bar/Pie)
+            self._impact_plan(lca_results, lca_json) if "bar" in chart_types else skip,
+            # 3. Scenario Comparison (Radar/Bar)
+            self._comparison_plan(lca_results, input_data["scenarios"])
+            if "radar" in chart_types and "scenarios" in input_data else skip,
+        ]
+        # Charts that need the LLM share a single batched request
+        try:
+            sankey_data, impact_data, comparison_data = await self._resolve_charts(plans)
+        except Exception as e:
+            logger.error(f"Chart generation failed: {e}")
+            sankey_data, impact_data, comparison_data = (plan[0] for plan in plans)
+        
+        if sankey_data and save_diagrams:
+            # Save visualization to DB
+            await self._generate_and_save_diagrams(input_data, lca_results)
+        
+        charts = []
+        if sankey_data:
+            charts.append({
+                "id": "sankey_flow",
+                "type": "sankey",
+                "title": "Material and Energy Flow",
+                "data": sankey_data,
+                "library": "d3"
+            })
+        if impact_data:
+            charts.append({
+                "id": "impact_breakdown",
+                "type": "bar",
+                "title": "Environmental Impact Breakdown",
+                "data": impact_data,
+                "library": "chart.js"
+            })
+        if comparison_data:
+            charts.append({
+                "id": "scenario_comparison",
+                "type": "radar",
+                "title": "Scenario Comparison",
+                "data": comparison_data,
+                "library": "chart.js"
+            })
         
         return {
             "status": "success",
@@ -147,63 +424,64 @@ class VisualizationAgent(BaseCircuMetalAgent):
                 "chart_count": len(charts),
                 "render_library": "chart.js"
             },
-            "log": f"Generated {len(charts)} chart specifications and saved HTML diagrams",
+            "log": f"Generated {len(charts)} chart specifications"
+                   + (" and saved HTML diagrams" if save_diagrams and sankey_data else ""),
             "confidence": 0.95,
             "provenance": provenance,
             "run_id": run_id
         }
 
+    @staticmethod
+    def _resolve_project_id(input_data: Dict[str, Any]) -> Optional[str]:
+        """Project to store diagrams under, from the input or its metadata."""
+        return input_data.get("project_id") or input_data.get("metadata", {}).get("project_id")
+
     async def _generate_and_save_diagrams(self, input_data: Dict[str, Any], lca_results: Dict[str, Any]):
         """Generate and save HTML diagrams to MongoDB."""
+        # Checked first, so nothing is generated that can't be stored
+        project_id = self._resolve_project_id(input_data)
+        if not project_id:
+            logger.warning("No project_id found. Skipping diagram storage.")
+            return
+
         try:
             # Import here to avoid circular dependency
-            from api.database import save_visualization
+            from api.database import save_visualizations_bulk
         except ImportError:
-            logger.error("Could not import save_visualization from api.database")
+            logger.error("Could not import save_visualizations_bulk from api.database")
             return
 
-        project_id = input_data.get("project_id")
         project_name = input_data.get("project_name", "Unknown Project")
         metal_name = input_data.get("material", "Unknown Metal")
-        
-        # If project_id is missing, check metadata or don't save (as per requirement)
-        if not project_id:
-             meta = input_data.get("metadata", {})
-             project_id = meta.get("project_id")
-             
-        if not project_id:
-            logger.warning("No project_id found. Skipping diagram storage.")
-            return
 
-        # 1. Generate Sankey HTML
-        sankey_prompt = f"""
-        Generate a complete, self-contained HTML file with D3.js code to visualize a Sankey diagram 
-        for the lifecycle of {metal_name}.
+        # Both diagram prompts embed the same pretty-printed data
+        lca_json_pretty = fast_json.dumps(_slim_lca(lca_results), indent=True)
         
-        LCA Data:
-        {json.dumps(lca_results, indent=2)}
+        # 1. Sankey HTML
+        sankey_prompt = self._SANKEY_HTML_PROMPT.format(metal_name=metal_name, data=lca_json_pretty)
         
-        Requirements:
-        - Use D3.js v7 (CDN link).
-        - The diagram should show flows from Raw Material -> Processing -> Manufacturing -> Use -> End of Life.
-        - Include recycling loops back to earlier stages.
-        - Use a modern, clean color scheme.
-        - Make it responsive.
-        - Return ONLY the HTML code, starting with <!DOCTYPE html>.
-        """
+        # 2. Flowchart HTML (Mermaid)
+        flowchart_prompt = self._FLOWCHART_HTML_PROMPT.format(metal_name=metal_name, data=lca_json_pretty)
         
-        sankey_system = "You are a D3.js visualization expert. Generate complete, working HTML files with embedded D3.js code. Return only the HTML code without any markdown formatting or explanations."
-        sankey_html = await self.run_llm_raw(sankey_prompt, sankey_system)
+        # Both diagrams are independent LLM calls, so generate them concurrently
+        sankey_html, flowchart_html = await asyncio.gather(
+            self._cached(
+                self._cache_key("sankey_html", metal_name, lca_json_pretty),
+                lambda: self.run_llm_raw(sankey_prompt, self._SANKEY_HTML_SYSTEM)
+            ),
+            self._cached(
+                self._cache_key("flowchart_html", metal_name, lca_json_pretty),
+                lambda: self.run_llm_raw(flowchart_prompt, self._FLOWCHART_HTML_SYSTEM)
+            )
+        )
         
         # Clean up markdown
-        if sankey_html.startswith("```html"):
-            sankey_html = sankey_html[7:]
-        if sankey_html.endswith("```"):
-            sankey_html = sankey_html[:-3]
-            
-        # Save Sankey
-        try:
-            await save_visualization({
+        sankey_html = _strip_code_fence(sankey_html)
+        flowchart_html = _strip_code_fence(flowchart_html)
+        
+        # Save both diagrams in one bulk write
+        docs = [
+            {
                 "project_id": project_id,
                 "diagram_type": "sankey",
                 "title": f"Sankey Diagram - {metal_name}",
@@ -211,38 +489,8 @@ class VisualizationAgent(BaseCircuMetalAgent):
                 "metal_name": metal_name,
                 "project_name": project_name,
                 "metadata": {"run_id": input_data.get("run_id")}
-            })
-        except Exception as e:
-            logger.error(f"Failed to save Sankey diagram: {e}")
-        
-        # 2. Generate Flowchart HTML (Mermaid)
-        flowchart_prompt = f"""
-        Generate a complete, self-contained HTML file with Mermaid.js to visualize a process flowchart 
-        for the lifecycle of {metal_name}.
-        
-        LCA Data:
-        {json.dumps(lca_results, indent=2)}
-        
-        Requirements:
-        - Use Mermaid.js (CDN link).
-        - Create a 'graph LR' (Left to Right) flowchart.
-        - Show the main process steps and decision points.
-        - Style the nodes to look professional.
-        - Return ONLY the HTML code, starting with <!DOCTYPE html>.
-        """
-        
-        flowchart_system = "You are a Mermaid.js visualization expert. Generate complete, working HTML files with embedded Mermaid.js diagrams. Return only the HTML code without any markdown formatting or explanations."
-        flowchart_html = await self.run_llm_raw(flowchart_prompt, flowchart_system)
-        
-        # Clean up markdown
-        if flowchart_html.startswith("```html"):
-            flowchart_html = flowchart_html[7:]
-        if flowchart_html.endswith("```"):
-            flowchart_html = flowchart_html[:-3]
-            
-        # Save Flowchart
-        try:
-            await save_visualization({
+            },
+            {
                 "project_id": project_id,
                 "diagram_type": "flowchart",
                 "title": f"Process Flowchart - {metal_name}",
@@ -250,49 +498,91 @@ class VisualizationAgent(BaseCircuMetalAgent):
                 "metal_name": metal_name,
                 "project_name": project_name,
                 "metadata": {"run_id": input_data.get("run_id")}
-            })
+            }
+        ]
+        try:
+            await save_visualizations_bulk(docs)
         except Exception as e:
-            logger.error(f"Failed to save Flowchart diagram: {e}")
+            logger.error(f"Failed to save diagrams: {e}")
 
-    async def _generate_sankey_data(self, lca_results: Dict, input_data: Dict) -> Dict:
-        """Generate data structure for Sankey diagram."""
-        # This would typically use the LLM to extract nodes and links
-        # For now, we'll return a simplified structure or use LLM
-        
-        prompt = f"""
-        Extract nodes and links for a Sankey diagram from this LCA data.
-        Return JSON with 'nodes' (list of names) and 'links' (source, target, value).
-        
-        Data: {json.dumps(lca_results)}
+    async def _generate_sankey_data(
+        self,
+        lca_results: Dict,
+        input_data: Dict,
+        lca_json: Optional[str] = None
+    ) -> Dict:
+        """
+        Generate data structure for Sankey diagram.
+        lca_json is lca_results already slimmed and serialized, if the
+        caller has it.
         """
+        return (await self._resolve_charts([self._sankey_plan(lca_results, lca_json)]))[0]
+
+    def _sankey_plan(self, lca_results: Dict, lca_json: Optional[str] = None) -> Tuple:
+        # Read straight from the results when they carry a GWP breakdown
+        sankey = _extract_sankey(lca_results)
+        if sankey is not None:
+            return sankey, None, None
         
-        response = await self.run_llm({"prompt": prompt})
-        return self._parse_llm_response(response)
+        # Otherwise ask the LLM to work out the flows
+        if lca_json is None:
+            lca_json = fast_json.dumps(_slim_lca(lca_results))
+        return (
+            None,
+            self._cache_key("sankey_data", lca_json),
+            self._SANKEY_DATA_PROMPT.format(data=lca_json)
+        )
 
-    async def _generate_impact_breakdown(self, lca_results: Dict) -> Dict:
+    async def _generate_impact_breakdown(
+        self,
+        lca_results: Dict,
+        lca_json: Optional[str] = None
+    ) -> Dict:
         """Generate data for impact breakdown chart."""
-        prompt = f"""
-        Extract environmental impact breakdown data for a bar chart.
-        Return JSON with 'labels' (impact categories) and 'datasets' (values).
-        
-        Data: {json.dumps(lca_results)}
-        """
-        
-        response = await self.run_llm({"prompt": prompt})
-        return self._parse_llm_response(response)
+        return (await self._resolve_charts([self._impact_plan(lca_results, lca_json)]))[0]
 
-    async def _generate_scenario_comparison(self, lca_results: Dict, scenarios: List) -> Dict:
-        """Generate data for scenario comparison."""
-        prompt = f"""
-        Compare the baseline LCA results with these scenarios.
-        Return JSON for a radar chart with 'labels' (metrics) and 'datasets' (one for baseline, one for each scenario).
+    def _impact_plan(self, lca_results: Dict, lca_json: Optional[str] = None) -> Tuple:
+        # Read straight from the results when they carry stage breakdowns
+        breakdown = _extract_impact_breakdown(lca_results)
+        if breakdown is not None:
+            return breakdown, None, None
         
-        Baseline: {json.dumps(lca_results)}
-        Scenarios: {json.dumps(scenarios)}
+        # Otherwise ask the LLM to work out the breakdown
+        if lca_json is None:
+            lca_json = fast_json.dumps(_slim_lca(lca_results))
+        return (
+            None,
+            self._cache_key("impact_breakdown", lca_json),
+            self._IMPACT_PROMPT.format(data=lca_json)
+        )
+
+    async def _generate_scenario_comparison(
+        self,
+        lca_results: Dict,
+        scenarios: List
+    ) -> Dict:
         """
-        
-        response = await self.run_llm({"prompt": prompt})
-        return self._parse_llm_response(response)
+        Generate data for scenario comparison.
+        Only numeric metrics are sent, since that is all a radar chart plots.
+        """
+        return (await self._resolve_charts([self._comparison_plan(lca_results, scenarios)]))[0]
+
+    def _comparison_plan(self, lca_results: Dict, scenarios: List) -> Tuple:
+        lca_json = fast_json.dumps(_metric_vector(lca_results))
+        scenarios_json = fast_json.dumps([
+            {
+                "name": scenario.get("name", scenario.get("id", f"Scenario {idx + 1}")),
+                "metrics": _metric_vector(scenario)
+            }
+            if isinstance(scenario, dict) else scenario
+            for idx, scenario in enumerate(scenarios)
+        ])
+
+        return (
+            None,
+            self._cache_key("scenario_comparison", lca_json, scenarios_json),
+            self._COMPARISON_PROMPT.format(baseline=lca_json, scenarios=scenarios_json)
+        )
 
     async def _generate_dashboard(self, input_data: Dict, provenance: List, run_id: str) -> Dict:
         """Generate dashboard layout and data."""
@@ -1,34 +1,38 @@
-import json
 import time
 import asyncio
 import logging
 import re
+from functools import cached_property
 from typing import Dict, Any
 
-from circu_metal.agents.data_agent import DataAgent
-from circu_metal.agents.estimation_agent import EstimationAgent
-from circu_metal.agents.lca_agent import LCAAgent
-from circu_metal.agents.circularity_agent import CircularityAgent
-from circu_metal.agents.scenario_agent import ScenarioAgent
-from circu_metal.agents.visualization_agent import VisualizationAgent
-from circu_metal.agents.explain_agent import ExplainAgent
-from circu_metal.agents.compliance_agent import ComplianceAgent
-from circu_metal.agents.critique_agent import CritiqueAgent
+from circu_metal.utils import fast_json
+from circu_metal.utils.rate_limit import get_llm_rate_limiter
+
+
+# Pattern to match various Gemini model names
+GEMINI_PATTERN = re.compile(r'gemini-[\w\.\-]+', re.IGNORECASE)
+_SUB = GEMINI_PATTERN.sub
+
+
+def _rebrand(text: str) -> str:
+    # A substring check is far cheaper than the regex and almost always misses
+    return _SUB('CircuMetal', text) if 'gemini' in text.lower() else text
 
 
 class CircuMetalLogFilter(logging.Filter):
     """Filter to replace Gemini model names with CircuMetal branding in logs."""
     
-    # Pattern to match various Gemini model names
-    GEMINI_PATTERN = re.compile(r'gemini-[\w\.\-]+', re.IGNORECASE)
+    GEMINI_PATTERN = GEMINI_PATTERN
     
     def filter(self, record):
-        if record.msg:
-            record.msg = self.GEMINI_PATTERN.sub('CircuMetal', str(record.msg))
-        if record.args:
+        msg = record.msg
+        if msg:
+            record.msg = _rebrand(msg if isinstance(msg, str) else str(msg))
+        args = record.args
+        if args and isinstance(args, tuple):
             record.args = tuple(
-                self.GEMINI_PATTERN.sub('CircuMetal', str(arg)) if isinstance(arg, str) else arg
-                for arg in record.args
+                _rebrand(arg) if isinstance(arg, str) else arg
+                for arg in args
             )
         return True
 
@@ -47,98 +51,190 @@ for logger_name in ['google', 'google.adk', 'httpx', 'httpcore', 'urllib3']:
 
 logger = logging.getLogger(__name__)
 
+class ContextBuilder:
+    """
+    The workflow context plus its JSON form. The JSON is only rebuilt after
+    the context changes, so stages that pass the context on unchanged
+    share one serialization.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self._json = None
+
+    def update(self, other: dict):
+        if other:
+            self.data.update(other)
+            self._json = None
+
+    def as_json(self) -> str:
+        if self._json is None:
+            self._json = fast_json.dumps(self.data, default=str)
+        return self._json
+
+
 class Orchestrator:
-    def __init__(self):
-        self.data_agent = DataAgent()
-        self.estimation_agent = EstimationAgent()
-        self.lca_agent = LCAAgent()
-        self.circularity_agent = CircularityAgent()
-        self.scenario_agent = ScenarioAgent()
-        self.visualization_agent = VisualizationAgent()
-        self.explain_agent = ExplainAgent()
-        self.compliance_agent = ComplianceAgent()
-        self.critique_agent = CritiqueAgent()
+    @cached_property
+    def rate_limiter(self):
+        return get_llm_rate_limiter()
+
+    # Agents are imported and built on first use, so callers only pay
+    # for the ones they actually run
+
+    @cached_property
+    def data_agent(self):
+        from circu_metal.agents.data_agent import DataAgent
+        return DataAgent()
+
+    @cached_property
+    def estimation_agent(self):
+        from circu_metal.agents.estimation_agent import EstimationAgent
+        return EstimationAgent()
+
+    @cached_property
+    def lca_agent(self):
+        from circu_metal.agents.lca_agent import LCAAgent
+        return LCAAgent()
+
+    @cached_property
+    def circularity_agent(self):
+        from circu_metal.agents.circularity_agent import CircularityAgent
+        return CircularityAgent()
+
+    @cached_property
+    def scenario_agent(self):
+        from circu_metal.agents.scenario_agent import ScenarioAgent
+        return ScenarioAgent()
+
+    @cached_property
+    def visualization_agent(self):
+        from circu_metal.agents.visualization_agent import VisualizationAgent
+        return VisualizationAgent()
+
+    @cached_property
+    def explain_agent(self):
+        from circu_metal.agents.explain_agent import ExplainAgent
+        return ExplainAgent()
+
+    @cached_property
+    def compliance_agent(self):
+        from circu_metal.agents.compliance_agent import ComplianceAgent
+        return ComplianceAgent()
+
+    @cached_property
+    def critique_agent(self):
+        from circu_metal.agents.critique_agent import CritiqueAgent
+        return CritiqueAgent()
 
     def _log_step(self, step_name: str, input_data: dict, output_data: dict):
-        logger.info(f"=== {step_name} ===")
-        logger.info(f"Input Keys: {list(input_data.keys())}")
-        logger.info(f"Output Status: {output_data.get('status', 'unknown')}")
+        # Lazy %-formatting, so filtered-out records cost no string building
+        logger.info("=== %s ===", step_name)
+        logger.info("Input Keys: %s", list(input_data))
+        logger.info("Output Status: %s", output_data.get('status', 'unknown'))
         if output_data.get('status') == 'success':
-            logger.info(f"Output Data Keys: {list(output_data.get('data', {}).keys())}")
+            logger.info("Output Data Keys: %s", list(output_data.get('data', {})))
         else:
-            logger.warning(f"Step Failed. Log: {output_data.get('log')}")
-        logger.debug(f"Full Output: {json.dumps(output_data, indent=2)}")
+            logger.warning("Step Failed. Log: %s", output_data.get('log'))
+        # Serializing the full output is expensive, so only do it when it's logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full Output: %s", fast_json.dumps(output_data, default=str, indent=True))
+
+    @staticmethod
+    def _extract_data(raw) -> dict:
+        """
+        Returns the 'data' dict of an agent result, or {} if the result has
+        no usable data. Accepts results still in JSON text form.
+        """
+        if isinstance(raw, dict):
+            data = raw.get('data')
+            return data if isinstance(data, dict) else {}
+        if isinstance(raw, (str, bytes)):
+            try:
+                parsed = fast_json.loads(raw)
+            except fast_json.JSONDecodeError:
+                return {}
+            return Orchestrator._extract_data(parsed) if isinstance(parsed, dict) else {}
+        return {}
+
+    @staticmethod
+    def _stage_failure(step_name: str, error: Exception) -> dict:
+        """Failure result recorded for an agent that raised."""
+        return {
+            "status": "failure",
+            "data": {},
+            "log": f"Error in {step_name}: {str(error)}",
+            "confidence": 0.0
+        }
 
 
 
     async def run(self, initial_input: dict) -> dict:
         """
-        Pure sequential execution - one agent at a time with delays.
+        Runs the agents in dependency order. Independent stages run
+        together, and every agent call takes a token from the LLM rate
+        limiter rather than waiting a fixed delay.
         """
-        context = initial_input.copy()
+        # The legacy agents get the context as JSON text from the builder
+        ctx = ContextBuilder(initial_input.copy())
         history = {}
-        loop = asyncio.get_running_loop()
 
-        # Helper to run agents - handles both sync (legacy) and async agents
+        # Helper to run agents - every agent exposes an awaitable ahandle()
         async def run_agent(agent, input_data):
-            import inspect
-            handle_method = agent.handle
-            # Check if handle is a coroutine function (async)
-            if inspect.iscoroutinefunction(handle_method):
-                # Async agent - await directly
-                return await handle_method(input_data)
-            else:
-                # Sync agent - run in thread pool
-                return await loop.run_in_executor(None, handle_method, input_data)
+            async with self.rate_limiter:
+                return await agent.ahandle(input_data)
 
         # 1. Data Agent
         print("--- Step 1: Data Agent ---")
-        res1 = await run_agent(self.data_agent, context)
-        self._log_step("Data Agent", context, res1)
+        res1 = await run_agent(self.data_agent, ctx.as_json())
+        self._log_step("Data Agent", ctx.data, res1)
         history['data_agent'] = res1
         if res1.get('status') == 'success':
-            context = res1.get('data', {})
+            ctx = ContextBuilder(self._extract_data(res1))
         else:
             print("Data Agent failed.")
             return history
-        await asyncio.sleep(8)
 
         # 2. Estimation Agent
         print("--- Step 2: Estimation Agent ---")
-        res2 = await run_agent(self.estimation_agent, context)
-        self._log_step("Estimation Agent", context, res2)
+        res2 = await run_agent(self.estimation_agent, ctx.as_json())
+        self._log_step("Estimation Agent", ctx.data, res2)
         history['estimation_agent'] = res2
         if res2.get('status') == 'success':
-            context = res2.get('data', {})
-        await asyncio.sleep(8)
+            ctx = ContextBuilder(self._extract_data(res2))
 
-        # 3. LCA Agent
-        print("--- Step 3: LCA Agent ---")
-        res3 = await run_agent(self.lca_agent, context)
-        self._log_step("LCA Agent", context, res3)
+        # 3-4. LCA and Circularity both work from the estimated inventory
+        # and not from each other, so they run concurrently on the same input.
+        # Scenario needs the LCA results and waits for both.
+        print("--- Steps 3-4: LCA and Circularity Agents ---")
+        stage_json = ctx.as_json()
+        res3, res4 = await asyncio.gather(
+            run_agent(self.lca_agent, stage_json),
+            run_agent(self.circularity_agent, stage_json),
+            return_exceptions=True
+        )
+        if isinstance(res3, Exception):
+            res3 = self._stage_failure("LCA Agent", res3)
+        if isinstance(res4, Exception):
+            res4 = self._stage_failure("Circularity Agent", res4)
+        self._log_step("LCA Agent", ctx.data, res3)
+        self._log_step("Circularity Agent", ctx.data, res4)
         history['lca_agent'] = res3
-        if res3.get('status') == 'success' and 'data' in res3:
-            context.update(res3['data'])
-        await asyncio.sleep(8)
-
-        # 4. Circularity Agent
-        print("--- Step 4: Circularity Agent ---")
-        res4 = await run_agent(self.circularity_agent, context)
-        self._log_step("Circularity Agent", context, res4)
         history['circularity_agent'] = res4
-        if res4.get('status') == 'success' and 'data' in res4:
-            context.update(res4['data'])
-        await asyncio.sleep(8)
+        # Merged in the order the steps used to run
+        for res in (res3, res4):
+            if res.get('status') == 'success':
+                ctx.update(self._extract_data(res))
 
         # 5. Scenario Agent
         print("--- Step 5: Scenario Agent ---")
-        res5 = await run_agent(self.scenario_agent, context)
-        self._log_step("Scenario Agent", context, res5)
+        res5 = await run_agent(self.scenario_agent, ctx.as_json())
+        self._log_step("Scenario Agent", ctx.data, res5)
         history['scenario_agent'] = res5
-        await asyncio.sleep(8)
 
-        # 6. Visualization Agent (now using unified run_agent helper)
-        print("--- Step 6: Visualization Agent ---")
+        # 6-8. Visualization, Explain and Compliance don't feed into each
+        # other, only into the critique, so they run concurrently
+        print("--- Steps 6-8: Visualization, Explain and Compliance Agents ---")
+        context = ctx.data
         # Prepare input
         viz_input = context.copy()
         # Ensure lca_results is present
@@ -152,25 +248,25 @@ class Orchestrator:
             viz_input["project_id"] = initial_input["project_id"]
             viz_input["project_name"] = initial_input.get("project_name", "Unknown Project")
 
-        res6 = await run_agent(self.visualization_agent, viz_input)
-        self._log_step("Visualization Agent", viz_input, res6)
-        history['visualization_agent'] = res6
-        await asyncio.sleep(8)
-
-        # 7. Explain Agent
-        print("--- Step 7: Explain Agent ---")
-        explain_input = {"current_context": context, "history": history}
-        res7 = await run_agent(self.explain_agent, explain_input)
-        self._log_step("Explain Agent", explain_input, res7)
-        history['explain_agent'] = res7
-        await asyncio.sleep(8)
-
-        # 8. Compliance Agent
-        print("--- Step 8: Compliance Agent ---")
-        res8 = await run_agent(self.compliance_agent, context)
-        self._log_step("Compliance Agent", context, res8)
-        history['compliance_agent'] = res8
-        await asyncio.sleep(8)
+        # Explain sees the history of steps 1-5
+        explain_input = {"current_context": context, "history": dict(history)}
+
+        # (step name, history key, agent, agent input, input to log)
+        stages = (
+            ("Visualization Agent", "visualization_agent", self.visualization_agent, viz_input, viz_input),
+            ("Explain Agent", "explain_agent", self.explain_agent, explain_input, explain_input),
+            # Context is unchanged since step 5, so this reuses its JSON
+            ("Compliance Agent", "compliance_agent", self.compliance_agent, ctx.as_json(), context),
+        )
+        results = await asyncio.gather(
+            *(run_agent(agent, stage_input) for _, _, agent, stage_input, _ in stages),
+            return_exceptions=True
+        )
+        for (step_name, key, _, _, log_input), res in zip(stages, results):
+            if isinstance(res, Exception):
+                res = self._stage_failure(step_name, res)
+            self._log_step(step_name, log_input, res)
+            history[key] = res
 
         # 9. Critique Agent
         print("--- Step 9: Critique Agent ---")
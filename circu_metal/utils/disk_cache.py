@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from circu_metal.utils import fast_json
+
+
+class DiskCache:
+    """
+    Small persistent key-value cache backed by SQLite.
+    Values are stored as JSON and expire after ttl seconds, so
+    results survive process restarts without growing stale forever.
+    """
+
+    def __init__(self, directory: str, ttl: float = 30 * 24 * 3600):
+        os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "cache.sqlite3"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return fast_json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Stores value under key, replacing any existing entry."""
+        payload = fast_json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,45 @@
+"""
+JSON encoding/decoding helpers.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Decode errors are always instances of json.JSONDecodeError.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.debug("orjson not installed. Using standard library json.")
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(
+    obj: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+    sort_keys: bool = False,
+    indent: bool = False
+) -> str:
+    """Serialize obj to a JSON string (2-space indent when indent is set)."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return json.dumps(obj, default=default, sort_keys=sort_keys, indent=2 if indent else None)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a JSON string or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -9,6 +9,13 @@ def load_json(file_path: str) -> Dict[str, Any]:
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def load_prompt(file_path: str, default: str) -> str:
+    """Loads a prompt file, returning the default text if it does not exist."""
+    if not os.path.exists(file_path):
+        return default
+    with open(file_path, 'r') as f:
+        return f.read()
+
 def save_json(data: Dict[str, Any], file_path: str) -> None:
     """Saves data to a JSON file."""
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+from typing import Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns a process-wide event loop running in a daemon thread.
+    The loop is created on first use and reused by all sync callers,
+    so they avoid building and tearing down a loop per call.
+    """
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="circumetal-background-loop",
+                    daemon=True
+                )
+                thread.start()
+                _loop = loop
+    return _loop
+
+def run_in_background_loop(coro):
+    """Runs a coroutine on the background loop and blocks until it completes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+
+async def await_in_background_loop(coro):
+    """Runs a coroutine on the background loop and awaits it without blocking the caller's loop."""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_background_loop()))
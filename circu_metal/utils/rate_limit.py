@@ -0,0 +1,65 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+
+
+class LLMRateLimiter:
+    """
+    Token bucket over the LLM API request quota.
+    Callers only wait once the bucket is empty, rather than pausing
+    a fixed time before every request.
+    """
+
+    def __init__(self, rpm: int, burst: Optional[int] = None):
+        self.rpm = rpm
+        self.capacity = burst if burst is not None else max(1, rpm // 2)
+        self._interval = 60.0 / rpm
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Takes a token and returns how long to wait before using it.
+        The bucket goes negative while callers are queued, so each one
+        waits for its own refill slot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.capacity),
+                self._tokens + (now - self._updated) / self._interval
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens * self._interval
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+_limiter: Optional[LLMRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_llm_rate_limiter() -> LLMRateLimiter:
+    """
+    Returns the process-wide limiter, sized by the LLM_RPM environment
+    variable. The quota belongs to the API key, so all callers share it.
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = LLMRateLimiter(int(os.getenv("LLM_RPM", "10")))
+    return _limiter
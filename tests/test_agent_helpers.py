@@ -0,0 +1,301 @@
+"""
+Unit tests for the numerical and caching helpers used by the V2 agents.
+
+These exercise local code paths only; no LLM or service calls are made.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The agent modules build on Google ADK
+pytest.importorskip("google.adk")
+
+
+class TestSobolIndices:
+    """Test Sobol indices against models with known analytic values."""
+
+    def test_linear_model(self):
+        """Test y = x1 + 2*x2 on U(0, 1), where S1 = ST = (0.2, 0.8)."""
+        from circu_metal.agents.scenario_agent_v2 import _sobol_indices
+
+        bounds = np.array([[0.0, 1.0], [0.0, 1.0]])
+        s1, st = _sobol_indices(
+            lambda x: x[:, 0] + 2 * x[:, 1], bounds, 4096, np.random.default_rng(0)
+        )
+
+        assert s1 == pytest.approx([0.2, 0.8], abs=0.05)
+        assert st == pytest.approx([0.2, 0.8], abs=0.05)
+
+    def test_ishigami(self):
+        """Test the Ishigami function (a=7, b=0.1) on U(-pi, pi)^3."""
+        from circu_metal.agents.scenario_agent_v2 import _sobol_indices
+
+        def ishigami(x):
+            return (
+                np.sin(x[:, 0])
+                + 7 * np.sin(x[:, 1]) ** 2
+                + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+            )
+
+        bounds = np.array([[-np.pi, np.pi]] * 3)
+        s1, st = _sobol_indices(ishigami, bounds, 16384, np.random.default_rng(1))
+
+        assert s1 == pytest.approx([0.3139, 0.4424, 0.0], abs=0.05)
+        assert st == pytest.approx([0.5576, 0.4424, 0.2437], abs=0.05)
+
+    def test_constant_model(self):
+        """Test a model with no output variance gives zero indices."""
+        from circu_metal.agents.scenario_agent_v2 import _sobol_indices
+
+        bounds = np.array([[0.0, 1.0], [0.0, 1.0]])
+        s1, st = _sobol_indices(
+            lambda x: np.ones(len(x)), bounds, 64, np.random.default_rng(0)
+        )
+
+        assert s1.tolist() == [0.0, 0.0]
+        assert st.tolist() == [0.0, 0.0]
+
+
+class TestSampleCount:
+    """Test validation of requested sample counts."""
+
+    def test_valid_counts(self):
+        """Test integers (and integer strings) within range are accepted."""
+        from circu_metal.agents.scenario_agent_v2 import _sample_count
+
+        assert _sample_count(100, 1000) == 100
+        assert _sample_count("100", 1000) == 100
+        assert _sample_count(2, 1000) == 2
+
+    def test_large_counts_are_clamped(self):
+        """Test counts above the maximum are clamped to it."""
+        from circu_metal.agents.scenario_agent_v2 import _sample_count
+
+        assert _sample_count(10 ** 12, 1000) == 1000
+
+    @pytest.mark.parametrize("value", [0, 1, -5, 1.5, "abc", None, True, float("nan"), float("inf")])
+    def test_invalid_counts(self, value):
+        """Test unusable counts are rejected."""
+        from circu_metal.agents.scenario_agent_v2 import _sample_count
+
+        assert _sample_count(value, 1000) is None
+
+
+class TestBatchValidation:
+    """Test vectorized batch validation in DataAgentV2."""
+
+    @pytest.fixture(autouse=True)
+    def _api_key(self, monkeypatch):
+        """The agent needs an API key to build, though no LLM call is made."""
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    def test_flags_missing_and_out_of_range(self):
+        """Test each rule is reported against the right record."""
+        from circu_metal.agents.data_agent_v2 import DataAgentV2
+
+        agent = DataAgentV2()
+        records = [
+            {"material": "steel", "process": "eaf", "production_volume": 1000, "recycled_content": 0.5},
+            {"material": "steel", "process": "eaf", "production_volume": -1},
+            {"material": "steel", "production_volume": 5e7, "recycled_content": 1.5}
+        ]
+        result = asyncio.run(agent._validate_batch({"records": records}, [], "run"))
+        data = result["data"]
+        found = {(i["record"], i["field"], i["issue"]) for i in data["issues"]}
+
+        assert found == {
+            (1, "production_volume", "invalid_value"),
+            (2, "process", "missing_required_field"),
+            (2, "production_volume", "unusual_value"),
+            (2, "recycled_content", "out_of_range")
+        }
+        assert data["validation_status"] == "invalid"
+        assert data["record_count"] == 3
+        assert data["invalid_record_count"] == 2
+        assert data["error_count"] == 3
+
+    def test_valid_batch(self):
+        """Test a clean batch validates without issues."""
+        from circu_metal.agents.data_agent_v2 import DataAgentV2
+
+        agent = DataAgentV2()
+        records = [{"material": "copper", "process": "smelting", "production_volume": 10}]
+        result = asyncio.run(agent._validate_batch({"records": records}, [], "run"))
+
+        assert result["data"]["validation_status"] == "valid"
+        assert result["data"]["issues"] == []
+
+    def test_non_numeric_values_are_reported(self):
+        """Test values that aren't numbers are flagged rather than raising."""
+        from circu_metal.agents.data_agent_v2 import DataAgentV2
+
+        agent = DataAgentV2()
+        records = [
+            {"material": "steel", "process": "eaf", "production_volume": "lots"},
+            {"material": "steel", "process": "eaf", "production_volume": None},
+            {"material": "steel", "process": "eaf", "production_volume": -1}
+        ]
+        result = asyncio.run(agent._validate_batch({"records": records}, [], "run"))
+        found = {(i["record"], i["issue"]) for i in result["data"]["issues"]}
+
+        assert found == {(0, "invalid_type"), (2, "invalid_value")}
+
+
+class TestRankGWP:
+    """Test scenario ranking by GWP."""
+
+    def test_ranks_lowest_first(self):
+        """Test scenarios are ordered by ascending GWP."""
+        from circu_metal.agents.lca_agent_v2 import _rank_gwp
+
+        order, improvement = _rank_gwp(np.array([2000.0, 1000.0, 1500.0]))
+
+        assert order == [1, 2, 0]
+        assert improvement == pytest.approx(50.0)
+
+    def test_ties_keep_input_order(self):
+        """Test equal GWPs keep their original order."""
+        from circu_metal.agents.lca_agent_v2 import _rank_gwp
+
+        order, _ = _rank_gwp(np.array([1000.0, 500.0, 1000.0, 500.0]))
+
+        assert order == [1, 3, 0, 2]
+
+    def test_non_positive_worst(self):
+        """Test improvement is 0 when the worst GWP is not positive."""
+        from circu_metal.agents.lca_agent_v2 import _rank_gwp
+
+        _, improvement = _rank_gwp(np.array([0.0, 0.0]))
+
+        assert improvement == 0
+
+
+class TestLCAServiceCoalescing:
+    """Test identical in-flight LCA service calls are shared."""
+
+    @pytest.fixture(autouse=True)
+    def _api_key(self, monkeypatch):
+        """The agent needs an API key to build, though no LLM call is made."""
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    def test_concurrent_identical_requests_share_one_call(self, monkeypatch):
+        """Test concurrent identical requests make a single service call."""
+        from circu_metal.agents import lca_agent_v2
+        from circu_metal.agents.lca_agent_v2 import LCAAgentV2
+
+        monkeypatch.setattr(lca_agent_v2, "_LCA_CACHE", lca_agent_v2.OrderedDict())
+        calls = []
+
+        async def call_service(self, **kwargs):
+            calls.append(kwargs["data"])
+            await asyncio.sleep(0.05)
+            return {"status": "success", "results": {"total_gwp": 1.0}}
+
+        monkeypatch.setattr(LCAAgentV2, "call_service", call_service)
+        agent = LCAAgentV2()
+        request = {"metal_type": "steel", "production_volume_tonnes": 123}
+
+        async def run():
+            results = await asyncio.gather(
+                *(LCAAgentV2()._call_lca_service(dict(request)) for _ in range(5)),
+                agent._call_lca_service({**request, "metal_type": "aluminium"})
+            )
+            return results, lca_agent_v2._inflight_calls()
+
+        results, inflight = asyncio.run(run())
+
+        assert len(calls) == 2
+        assert all(r == results[0] for r in results[:5])
+        # Each caller gets its own copy
+        assert len({id(r) for r in results[:5]}) == 5
+        assert inflight == {}
+
+    def test_failures_are_not_cached(self, monkeypatch):
+        """Test a failed call is retried on the next request."""
+        from circu_metal.agents import lca_agent_v2
+        from circu_metal.agents.lca_agent_v2 import LCAAgentV2
+
+        monkeypatch.setattr(lca_agent_v2, "_LCA_CACHE", lca_agent_v2.OrderedDict())
+        calls = []
+
+        async def call_service(self, **kwargs):
+            calls.append(1)
+            raise RuntimeError("service down")
+
+        monkeypatch.setattr(LCAAgentV2, "call_service", call_service)
+        monkeypatch.setattr(lca_agent_v2, "_get_fallback_engine", lambda: None)
+        agent = LCAAgentV2()
+        request = {"metal_type": "steel", "production_volume_tonnes": 456}
+
+        first = asyncio.run(agent._call_lca_service(request))
+        asyncio.run(agent._call_lca_service(request))
+
+        assert "error" in first
+        assert len(calls) == 2
+
+
+class TestChartExtraction:
+    """Test chart data built directly from LCA results."""
+
+    def test_impact_breakdown_from_impacts(self):
+        """Test bar chart data from per-category stage breakdowns."""
+        from circu_metal.agents.visualization_agent import _extract_impact_breakdown
+
+        lca = {
+            "impacts": [
+                {"category": "GWP", "unit": "kg CO2e", "breakdown": {"mining": 3, "smelting": 5}},
+                {"category": "water", "unit": "m3", "breakdown": {"smelting": 2, "casting": 1}}
+            ]
+        }
+        chart = _extract_impact_breakdown(lca)
+
+        assert chart["labels"] == ["mining", "smelting", "casting"]
+        assert chart["datasets"] == [
+            {"label": "GWP (kg CO2e)", "data": [3, 5, 0]},
+            {"label": "water (m3)", "data": [0, 2, 1]}
+        ]
+
+    def test_impact_breakdown_from_nested_results(self):
+        """Test a flat breakdown under "results" is found."""
+        from circu_metal.agents.visualization_agent import _extract_impact_breakdown
+
+        chart = _extract_impact_breakdown({"results": {"breakdown": {"a": 1.5, "b": 2.5}}})
+
+        assert chart["labels"] == ["a", "b"]
+        assert chart["datasets"][0]["data"] == [1.5, 2.5]
+
+    def test_impact_breakdown_without_data(self):
+        """Test results without numeric breakdowns give None."""
+        from circu_metal.agents.visualization_agent import _extract_impact_breakdown
+
+        assert _extract_impact_breakdown({}) is None
+        assert _extract_impact_breakdown({"breakdown": {"a": "high"}}) is None
+
+    def test_sankey_from_process_contributions(self):
+        """Test each stage's GWP flows into the total node."""
+        from circu_metal.agents.visualization_agent import _extract_sankey
+
+        lca = {"process_contributions": {"mining": {"gwp": 4}, "smelting": {"gwp": 6}, "credit": {"gwp": -1}}}
+        sankey = _extract_sankey(lca)
+
+        total = "Total GWP (kg CO2e)"
+        assert sankey["nodes"] == ["mining", "smelting", total]
+        # Negative contributions can't be drawn as flows
+        assert sankey["links"] == [
+            {"source": "mining", "target": total, "value": 4},
+            {"source": "smelting", "target": total, "value": 6}
+        ]
+
+    def test_sankey_without_gwp(self):
+        """Test results without a GWP breakdown give None."""
+        from circu_metal.agents.visualization_agent import _extract_sankey
+
+        lca = {"impacts": [{"category": "water", "unit": "m3", "breakdown": {"a": 1}}]}
+        assert _extract_sankey(lca) is None
+        assert _extract_sankey({"breakdown": {"a": 0}}) is None
@@ -0,0 +1,130 @@
+"""
+Unit tests for the shared agent utilities.
+
+Tests the on-disk result cache and the LLM rate limiter.
+"""
+
+import asyncio
+import time
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestDiskCache:
+    """Test the SQLite-backed result cache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test stored values come back unchanged."""
+        from circu_metal.utils.disk_cache import DiskCache
+
+        cache = DiskCache(str(tmp_path))
+        value = {"status": "success", "results": {"total_gwp": 1850.5, "stages": ["a", "b"]}}
+        cache.set("key", value)
+
+        assert cache.get("key") == value
+        assert cache.get("missing") is None
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test values survive reopening the cache directory."""
+        from circu_metal.utils.disk_cache import DiskCache
+
+        cache = DiskCache(str(tmp_path))
+        cache.set("key", {"a": 1})
+        cache.close()
+
+        reopened = DiskCache(str(tmp_path))
+        assert reopened.get("key") == {"a": 1}
+        reopened.close()
+
+    def test_overwrite(self, tmp_path):
+        """Test setting a key again replaces its value."""
+        from circu_metal.utils.disk_cache import DiskCache
+
+        cache = DiskCache(str(tmp_path))
+        cache.set("key", {"a": 1})
+        cache.set("key", {"a": 2})
+
+        assert cache.get("key") == {"a": 2}
+        cache.close()
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        """Test entries are not returned once their TTL has passed."""
+        from circu_metal.utils.disk_cache import DiskCache
+
+        cache = DiskCache(str(tmp_path), ttl=-1)
+        cache.set("key", {"a": 1})
+
+        assert cache.get("key") is None
+        # The expired row is deleted on read
+        row = cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        assert row[0] == 0
+        cache.close()
+
+
+class TestLLMRateLimiter:
+    """Test the token bucket used by the orchestrator."""
+
+    def test_burst_is_immediate(self):
+        """Test calls within the burst capacity don't wait."""
+        from circu_metal.utils.rate_limit import LLMRateLimiter
+
+        limiter = LLMRateLimiter(rpm=60, burst=3)
+        assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_queued_callers_wait_for_their_own_slot(self):
+        """Test each caller past the burst waits one more refill interval."""
+        from circu_metal.utils.rate_limit import LLMRateLimiter
+
+        limiter = LLMRateLimiter(rpm=60, burst=1)
+        delays = [limiter._reserve() for _ in range(4)]
+
+        assert delays[0] == 0.0
+        for expected, delay in zip((1.0, 2.0, 3.0), delays[1:]):
+            assert delay == pytest.approx(expected, abs=0.05)
+
+    def test_refill_over_time(self):
+        """Test tokens come back at the configured rate, up to capacity."""
+        from circu_metal.utils.rate_limit import LLMRateLimiter
+
+        limiter = LLMRateLimiter(rpm=60, burst=2)
+        limiter._reserve()
+        limiter._reserve()
+
+        # Two intervals later the bucket is full again, but no fuller
+        limiter._updated -= 5.0
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() > 0.0
+
+    def test_default_burst(self):
+        """Test the burst defaults to half the per-minute rate."""
+        from circu_metal.utils.rate_limit import LLMRateLimiter
+
+        assert LLMRateLimiter(rpm=10).capacity == 5
+        assert LLMRateLimiter(rpm=1).capacity == 1
+
+    def test_async_context_manager_spaces_calls(self):
+        """Test concurrent acquirers are released one interval apart."""
+        from circu_metal.utils.rate_limit import LLMRateLimiter
+
+        limiter = LLMRateLimiter(rpm=1200, burst=1)  # 50 ms interval
+
+        async def run():
+            start = time.monotonic()
+            stamps = []
+
+            async def call():
+                async with limiter:
+                    stamps.append(time.monotonic() - start)
+
+            await asyncio.gather(*(call() for _ in range(3)))
+            return sorted(stamps)
+
+        stamps = asyncio.run(run())
+        assert stamps[0] < 0.03
+        assert stamps[1] >= 0.04
+        assert stamps[2] >= 0.09